@@ -1,9 +1,12 @@
 # imkerutils/exquisite/api/mock_gpt_client.py
 from __future__ import annotations
 
+import functools
 import hashlib
+import os
 from typing import Final
 
+import numpy as np
 from PIL import Image
 
 from imkerutils.exquisite.geometry.tile_mode import (
@@ -17,19 +20,31 @@ from imkerutils.exquisite.geometry.tile_mode import (
 def _rgb(img: Image.Image) -> Image.Image:
     return img.convert("RGB") if img.mode != "RGB" else img
 
-def _fill_deterministic(img: Image.Image, seed_bytes: bytes) -> None:
+# mode -> (new-half box inside the tile, band paste offset inside the tile)
+_HALF_BOXES: Final[dict[str, tuple[tuple[int, int, int, int], tuple[int, int]]]] = {
+    "x_ltr": ((BAND_PX, 0, TILE_PX, TILE_PX), (0, 0)),
+    "x_rtl": ((0, 0, EXT_PX, TILE_PX), (EXT_PX, 0)),
+    "y_ttb": ((0, BAND_PX, TILE_PX, TILE_PX), (0, 0)),
+    "y_btt": ((0, 0, TILE_PX, EXT_PX), (0, EXT_PX)),
+}
+
+@functools.lru_cache(maxsize=32)
+def _deterministic_new_half_bytes(mode: ExtendMode, seed_bytes: bytes) -> bytes:
     """
-    Deterministically fills an image with a simple pattern derived from seed_bytes.
-    No randomness; stable across runs/machines.
+    Raw L bytes of the new half of the deterministic tile pattern for `mode`.
+
+    seed_bytes is hashed to a 64-bit seed which drives NumPy's PCG64 bit
+    generator; the raw bit stream is stable for a given seed, so output is
+    reproducible across runs/machines. The full-tile stream is drawn so the
+    new half keeps its pixels, but only that half is cached (the band covers
+    the rest), as one gray plane: 512 KiB per entry. Cached because retries
+    re-request the same (mode, step_index, prompt) seed.
     """
-    w, h = img.size
-    digest = hashlib.sha256(seed_bytes).digest()
-    px = img.load()
-    n = len(digest)
-    for y in range(h):
-        for x in range(w):
-            b = digest[(x + 7 * y) % n]
-            px[x, y] = (b, b, b)
+    x0, y0, x1, y1 = _HALF_BOXES[mode][0]
+    seed = int.from_bytes(hashlib.blake2b(seed_bytes, digest_size=8).digest(), "little")
+    rng = np.random.Generator(np.random.PCG64(seed))
+    vals = np.frombuffer(rng.bytes(TILE_PX * TILE_PX), dtype=np.uint8).reshape(TILE_PX, TILE_PX)
+    return np.ascontiguousarray(vals[y0:y1, x0:x1]).tobytes()
 
 def generate_tile(
     *,
@@ -61,28 +76,26 @@ def generate_tile(
             f"conditioning_band must be {expected[0]}x{expected[1]}, got {conditioning_band.size}"
         )
 
-    # Create tile and fill with deterministic "new content"
-    tile = Image.new("RGB", (TILE_PX, TILE_PX))
-    seed = f"{mode}|{step_index}|{prompt}".encode("utf-8")
-    _fill_deterministic(tile, seed)
+    try:
+        (x0, y0, x1, y1), band_xy = _HALF_BOXES[mode]
+    except KeyError:
+        raise ValueError(f"Unknown mode: {mode}") from None
 
-    # Overwrite conditioning half exactly with the provided band
-    if mode == "x_ltr":
-        tile.paste(conditioning_band, (0, 0))
-    elif mode == "x_rtl":
-        tile.paste(conditioning_band, (EXT_PX, 0))
-    elif mode == "y_ttb":
-        tile.paste(conditioning_band, (0, 0))
-    elif mode == "y_btt":
-        tile.paste(conditioning_band, (0, EXT_PX))
-    else:
-        raise ValueError(f"Unknown mode: {mode}")
+    # Deterministic "new content" next to an exact copy of the provided band.
+    seed = f"{mode}|{step_index}|{prompt}".encode("utf-8")
+    gray = Image.frombytes("L", (x1 - x0, y1 - y0), _deterministic_new_half_bytes(mode, seed))
+    tile = Image.new("RGB", (TILE_PX, TILE_PX))
+    tile.paste(Image.merge("RGB", (gray, gray, gray)), (x0, y0))
+    tile.paste(conditioning_band, band_xy)
 
-    # Sanity: confirm convention is satisfied
-    cond_half, _ = split_tile(tile, mode)
-    if cond_half.size != conditioning_band.size:
-        raise AssertionError("conditioning half size mismatch after paste")
-    if cond_half.get_flattened_data() != conditioning_band.get_flattened_data():
-        raise AssertionError("conditioning half != band")
+    # Sanity: confirm convention is satisfied. The band was pasted just above,
+    # so this full-half compare is opt-in (IMKER_MOCK_SANITY=1) to keep it off
+    # the hot path.
+    if __debug__ and os.environ.get("IMKER_MOCK_SANITY") == "1":
+        cond_half, _ = split_tile(tile, mode)
+        if cond_half.size != conditioning_band.size:
+            raise AssertionError("conditioning half size mismatch after paste")
+        if cond_half.get_flattened_data() != conditioning_band.get_flattened_data():
+            raise AssertionError("conditioning half != band")
 
     return tile
\ No newline at end of file
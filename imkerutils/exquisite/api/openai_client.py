@@ -1,17 +1,26 @@
 # imkerutils/exquisite/api/openai_client.py
 from __future__ import annotations
 
-import base64
+import binascii
+import functools
 import io
+import logging
 import os
+import re
 from dataclasses import dataclass
+from typing import NoReturn
 
-from PIL import Image
-from openai import OpenAI
+import openai
+from PIL import Image, features
+from openai import AsyncOpenAI, OpenAI
 
 from imkerutils.exquisite.api.client import (
     TileGeneratorClient,
+    GeneratorError,
     GeneratorPermanentError,
+    GeneratorTransientError,
+    GeneratorSafetyRefusal,
+    GeneratorBillingLimitError,
 )
 from imkerutils.exquisite.geometry.tile_mode import (
     ExtendMode,
@@ -21,18 +30,95 @@ from imkerutils.exquisite.geometry.tile_mode import (
     OVERLAP_PX,
 )
 from imkerutils.exquisite.geometry.reference_tile import (
+    encode_mask_png_bytes,
     encode_png_bytes,
+    encode_webp_lossless_bytes,
     build_reference_tile_and_mask,
 )
 
+_log = logging.getLogger(__name__)
+
 MODEL_DEFAULT = "gpt-image-1.5"
 
+# APIStatusError.code -> generator error class. SDK errors are classified on
+# their type and code; the message regex below is only for non-SDK exceptions.
+_ERR_CODE_CLASS: dict[str, type[GeneratorError]] = {
+    "billing_hard_limit_reached": GeneratorBillingLimitError,
+    "moderation_blocked": GeneratorSafetyRefusal,
+}
+
+# One pass over a non-SDK error message; the matching named group picks the class.
+_ERR_RE = re.compile(
+    r"(?P<billing>billing[_ ]hard[_ ]limit)"
+    r"|(?P<transient>timeout|timed out|rate[_ ]limit)"
+    r"|(?P<safety>safety|content[_ ]policy|moderation)",
+    re.IGNORECASE,
+)
+_ERR_CLASS: dict[str, type[GeneratorError]] = {
+    "billing": GeneratorBillingLimitError,
+    "transient": GeneratorTransientError,
+    "safety": GeneratorSafetyRefusal,
+}
+
+
+# Far KEEP region of the conditioning band that is re-pasted verbatim after
+# generation. 0 under the full-half overlap contract (OVERLAP_PX == HALF_PX).
+_KEEP_PX = HALF_PX - OVERLAP_PX
+
+# mode -> (crop box inside band, paste offset inside tile) for the KEEP region.
+_KEEP_PASTE: dict[str, tuple[tuple[int, int, int, int], tuple[int, int]]] = {
+    "x_ltr": ((0, 0, _KEEP_PX, TILE_PX), (0, 0)),
+    "x_rtl": ((BAND_PX - _KEEP_PX, 0, BAND_PX, TILE_PX), (TILE_PX - _KEEP_PX, 0)),
+    "y_ttb": ((0, 0, TILE_PX, _KEEP_PX), (0, 0)),
+    "y_btt": ((0, BAND_PX - _KEEP_PX, TILE_PX, BAND_PX), (0, TILE_PX - _KEEP_PX)),
+}
+
+
+@functools.lru_cache(maxsize=4)
+def _get_openai(api_key: str) -> OpenAI:
+    # One SDK client (and its httpx connection pool) per API key, shared by
+    # every OpenAITileGeneratorClient built with that key.
+    return OpenAI(api_key=api_key)
+
+
+def _ensure_mode(img: Image.Image, mode: str) -> Image.Image:
+    # Image.convert always allocates, even when the mode already matches.
+    return img if img.mode == mode else img.convert(mode)
+
+
+def _classify_error_message(msg: str) -> type[GeneratorError] | None:
+    m = _ERR_RE.search(msg)
+    return _ERR_CLASS[m.lastgroup] if m and m.lastgroup else None
+
+
+def _reraise_classified(e: Exception) -> NoReturn:
+    """
+    Re-raise an images.edit failure as the matching GeneratorError, or
+    unchanged when it maps to none. Call from inside the except block.
+    """
+    err_cls: type[GeneratorError] | None
+    if isinstance(e, (openai.APITimeoutError, openai.RateLimitError)):
+        err_cls = GeneratorTransientError
+    elif isinstance(e, openai.APIStatusError):
+        err_cls = _ERR_CODE_CLASS.get(e.code or "")
+    elif isinstance(e, openai.OpenAIError):
+        err_cls = None
+    else:
+        err_cls = _classify_error_message(str(e))
+    if err_cls is None:
+        raise e
+    raise err_cls(str(e)) from e
+
 
 @dataclass(frozen=True)
 class OpenAITileGeneratorConfig:
     model: str = MODEL_DEFAULT
     timeout_s: float | None = None
     input_fidelity: str | None = "high"  # try to preserve given pixels
+    # Upload encoding for the reference tile: "webp" (lossless) or "png".
+    # The mask is always PNG (images.edit requires it).
+    reference_format: str = "webp"
+    png_compress_level: int = 1  # upload-only bytes; zlib level 6 buys little here
 
 
 class OpenAITileGeneratorClient(TileGeneratorClient):
@@ -57,7 +143,9 @@ class OpenAITileGeneratorClient(TileGeneratorClient):
         if not api_key:
             raise GeneratorPermanentError("OPENAI_API_KEY not set")
 
-        self._client = OpenAI(api_key=api_key)
+        self._api_key = api_key
+        self._client = _get_openai(api_key)
+        self._async_client: AsyncOpenAI | None = None
         self._config = config or OpenAITileGeneratorConfig()
 
     def generate_tile(
@@ -68,7 +156,60 @@ class OpenAITileGeneratorClient(TileGeneratorClient):
         prompt: str,
         step_index: int,
     ) -> Image.Image:
-        band = conditioning_band.convert("RGB")
+        band, edit_kwargs = self._prepare_edit(
+            conditioning_band=conditioning_band, mode=mode, prompt=prompt, step_index=step_index
+        )
+
+        try:
+            result = self._client.images.edit(**edit_kwargs)
+        except Exception as e:
+            _reraise_classified(e)
+
+        return self._finish_edit(result, band, mode)
+
+    async def generate_tile_async(
+        self,
+        *,
+        conditioning_band: Image.Image,
+        mode: ExtendMode,
+        prompt: str,
+        step_index: int,
+    ) -> Image.Image:
+        """
+        Same contract as generate_tile, but awaits images.edit on AsyncOpenAI so
+        independent tiles (e.g. one per extend mode) can be issued together:
+
+            await asyncio.gather(*(client.generate_tile_async(...) for ...))
+
+        The async SDK client is created on first use and is bound to that
+        event loop; use one loop per adapter instance.
+        """
+        band, edit_kwargs = self._prepare_edit(
+            conditioning_band=conditioning_band, mode=mode, prompt=prompt, step_index=step_index
+        )
+
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(api_key=self._api_key)
+
+        try:
+            result = await self._async_client.images.edit(**edit_kwargs)
+        except Exception as e:
+            _reraise_classified(e)
+
+        return self._finish_edit(result, band, mode)
+
+    def _prepare_edit(
+        self,
+        *,
+        conditioning_band: Image.Image,
+        mode: ExtendMode,
+        prompt: str,
+        step_index: int,
+    ) -> tuple[Image.Image, dict]:
+        """
+        Validate the band and build the images.edit keyword arguments.
+        """
+        band = _ensure_mode(conditioning_band, "RGB")
 
         # Sanity: band dimensions must match tile_mode contract.
         if mode in ("x_ltr", "x_rtl"):
@@ -84,57 +225,66 @@ class OpenAITileGeneratorClient(TileGeneratorClient):
 
         # Build 1024x1024 reference canvas + 1024x1024 RGBA mask (Convention B).
         ref_and_mask = build_reference_tile_and_mask(conditioning_band=band, mode=mode)
-        ref_rgb = ref_and_mask.reference_tile_rgb.convert("RGB")
-        mask_rgba = ref_and_mask.mask_rgba.convert("RGBA")
+        ref_rgb = _ensure_mode(ref_and_mask.reference_tile_rgb, "RGB")
 
-        ref_file = io.BytesIO(encode_png_bytes(ref_rgb))
-        ref_file.name = f"ref_step_{step_index}.png"
+        # BytesIO(bytes) shares the encoded payload until written, so the
+        # uploads cost no copy beyond the encode itself.
+        if self._config.reference_format == "webp" and features.check("webp"):
+            ref_file = io.BytesIO(encode_webp_lossless_bytes(ref_rgb))
+            ref_file.name = f"ref_step_{step_index}.webp"
+        else:
+            ref_file = io.BytesIO(encode_png_bytes(ref_rgb, compress_level=self._config.png_compress_level))
+            ref_file.name = f"ref_step_{step_index}.png"
 
-        mask_file = io.BytesIO(encode_png_bytes(mask_rgba))
+        # The mask depends only on mode: reuse its encoded bytes.
+        mask_file = io.BytesIO(encode_mask_png_bytes(mode, compress_level=self._config.png_compress_level))
         mask_file.name = f"mask_step_{step_index}.png"
 
         simple_prompt = _build_simple_prompt(mode=mode, user_prompt=prompt)
-        print(f"OpenAI API prompt for step {step_index}:\n{simple_prompt}\n---END PROMPT---\n")
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug("OpenAI API prompt for step %d:\n%s\n---END PROMPT---", step_index, simple_prompt)
 
-        kwargs: dict = {}
+        kwargs: dict = {
+            "model": self._config.model,
+            "image": [ref_file],
+            "mask": mask_file,
+            "prompt": simple_prompt,
+            "size": "1024x1024",
+        }
         if self._config.input_fidelity is not None:
             kwargs["input_fidelity"] = self._config.input_fidelity
 
-        result = self._client.images.edit(
-            model=self._config.model,
-            image=[ref_file],
-            mask=mask_file,
-            prompt=simple_prompt,
-            size="1024x1024",
-            **kwargs,
-        )
+        return band, kwargs
 
+    def _finish_edit(self, result, band: Image.Image, mode: ExtendMode) -> Image.Image:
+        # a2b_base64 takes the ASCII str as-is (b64decode would first copy it to
+        # bytes), and BytesIO(bytes) shares the decoded buffer until written, so
+        # the PNG payload is materialized exactly once.
         image_base64 = result.data[0].b64_json
-        tile = Image.open(io.BytesIO(base64.b64decode(image_base64))).convert("RGB")
+        tile = Image.open(io.BytesIO(binascii.a2b_base64(image_base64))).convert("RGB")
 
         if tile.size != (TILE_PX, TILE_PX):
             raise GeneratorPermanentError(f"Bad tile size: {tile.size}")
 
-        # Preserve the far KEEP region (256px) exactly (existing behavior).
+        # Preserve the far KEEP region (HALF_PX - OVERLAP_PX) exactly (existing behavior).
         return self._post_enforce_conditioning_keep(tile, band, mode)
 
     def _post_enforce_conditioning_keep(self, tile: Image.Image, band: Image.Image, mode: ExtendMode) -> Image.Image:
-        KEEP_PX = HALF_PX - OVERLAP_PX  # 256
-
-        if mode == "x_ltr":
-            tile.paste(band.crop((0, 0, KEEP_PX, TILE_PX)), (0, 0))
-        elif mode == "x_rtl":
-            tile.paste(band.crop((BAND_PX - KEEP_PX, 0, BAND_PX, TILE_PX)), (TILE_PX - KEEP_PX, 0))
-        elif mode == "y_ttb":
-            tile.paste(band.crop((0, 0, TILE_PX, KEEP_PX)), (0, 0))
-        elif mode == "y_btt":
-            tile.paste(band.crop((0, BAND_PX - KEEP_PX, TILE_PX, BAND_PX)), (0, TILE_PX - KEEP_PX))
-        else:
+        keep = _KEEP_PASTE.get(mode)
+        if keep is None:
             raise GeneratorPermanentError("Unknown mode")
 
+        # Empty KEEP region: crop+paste would allocate a zero-size image per call
+        # and copy nothing, so skip it.
+        if _KEEP_PX <= 0:
+            return tile
+
+        src_box, dst_xy = keep
+        tile.paste(band.crop(src_box), dst_xy)
         return tile
 
 
+@functools.lru_cache(maxsize=64)
 def _build_simple_prompt(*, mode: ExtendMode, user_prompt: str) -> str:
     user_prompt = (user_prompt or "").strip()
 
@@ -1,6 +1,8 @@
 # imkerutils/exquisite/geometry/overlap_score.py
 from __future__ import annotations
 
+import functools
+
 import numpy as np
 from PIL import Image
 
@@ -8,38 +10,60 @@ from imkerutils.exquisite.geometry.tile_mode import (
     ExtendMode, TILE_PX, HALF_PX, OVERLAP_PX
 )
 
-def _to_gray_f32(img: Image.Image) -> np.ndarray:
-    g = img.convert("L")
-    a = np.asarray(g, dtype=np.float32) / 255.0
-    return a
+def _rgb(img: Image.Image) -> Image.Image:
+    return img if img.mode == "RGB" else img.convert("RGB")
 
-def _sobel_mag(gray: np.ndarray) -> np.ndarray:
-    # gray: (H, W)
-    # simple Sobel
-    kx = np.array([[-1, 0, 1],
-                   [-2, 0, 2],
-                   [-1, 0, 1]], dtype=np.float32)
-    ky = np.array([[-1, -2, -1],
-                   [ 0,  0,  0],
-                   [ 1,  2,  1]], dtype=np.float32)
-
-    # pad
-    p = np.pad(gray, ((1, 1), (1, 1)), mode="edge")
-    H, W = gray.shape
-    gx = np.zeros((H, W), dtype=np.float32)
-    gy = np.zeros((H, W), dtype=np.float32)
-
-    # conv (small and fast enough for 1024x256)
-    for y in range(H):
-        for x in range(W):
-            window = p[y:y+3, x:x+3]
-            gx[y, x] = float(np.sum(window * kx))
-            gy[y, x] = float(np.sum(window * ky))
-
-    return np.sqrt(gx * gx + gy * gy)
+_LUMA_F32 = np.array([0.299, 0.587, 0.114], dtype=np.float32) * np.float32(1.0 / 255.0)
 
+def _to_gray_f32(rgb: np.ndarray) -> np.ndarray:
+    # rgb: (H, W, 3) uint8 -> (H, W) float32 luma in [0, 1], one matmul pass.
+    return rgb @ _LUMA_F32
+
+def _diff_edge(a: np.ndarray, axis: int) -> np.ndarray:
+    # central difference [-1, 0, 1] along axis, edge-replicated at the borders
+    a = np.moveaxis(a, axis, -1)
+    out = np.empty_like(a)
+    if a.shape[-1] < 2:
+        out[...] = 0.0
+    else:
+        np.subtract(a[..., 2:], a[..., :-2], out=out[..., 1:-1])
+        np.subtract(a[..., 1], a[..., 0], out=out[..., 0])
+        np.subtract(a[..., -1], a[..., -2], out=out[..., -1])
+    return np.moveaxis(out, -1, axis)
+
+def _smooth_edge(a: np.ndarray, axis: int) -> np.ndarray:
+    # [1, 2, 1] along axis, edge-replicated at the borders
+    a = np.moveaxis(a, axis, -1)
+    out = np.empty_like(a)
+    if a.shape[-1] < 2:
+        np.multiply(a, 4.0, out=out)
+    else:
+        np.add(a[..., :-2], a[..., 2:], out=out[..., 1:-1])
+        out[..., 1:-1] += 2.0 * a[..., 1:-1]
+        out[..., 0] = 3.0 * a[..., 0] + a[..., 1]
+        out[..., -1] = a[..., -2] + 3.0 * a[..., -1]
+    return np.moveaxis(out, -1, axis)
+
+def _sobel_mag(gray: np.ndarray) -> np.ndarray:
+    # gray: (..., H, W) -- leading axes are a batch of independent strips
+    # simple Sobel with edge replication, applied as separable passes so no
+    # padded copy of the input is needed:
+    #   kx = [[-1, 0, 1],      ky = [[-1, -2, -1],
+    #         [-2, 0, 2],            [ 0,  0,  0],
+    #         [-1, 0, 1]]            [ 1,  2,  1]]
+    #   gx = smooth_y(diff_x(gray)),  gy = smooth_x(diff_y(gray))
+    gx = _smooth_edge(_diff_edge(gray, -1), -2)
+    gy = _smooth_edge(_diff_edge(gray, -2), -1)
+
+    np.multiply(gx, gx, out=gx)
+    np.multiply(gy, gy, out=gy)
+    np.add(gx, gy, out=gx)
+    return np.sqrt(gx, out=gx)
+
+@functools.lru_cache(maxsize=8)
 def _edge_weight(mask_shape: tuple[int, int], mode: ExtendMode) -> np.ndarray:
     # weights emphasize pixels closest to the seam boundary
+    # Cached per (shape, mode) -- only four ever occur -- and returned read-only.
     H, W = mask_shape
     if mode in ("x_ltr", "x_rtl"):
         # seam at left edge of generated strip for x_ltr; right edge for x_rtl strip choice.
@@ -48,56 +72,74 @@ def _edge_weight(mask_shape: tuple[int, int], mode: ExtendMode) -> np.ndarray:
         w = np.linspace(1.0, 0.2, W, dtype=np.float32)  # drop off across strip
         if mode == "x_rtl":
             w = w[::-1].copy()
-        return np.tile(w[None, :], (H, 1))
+        out = np.tile(w[None, :], (H, 1))
     else:
         w = np.linspace(1.0, 0.2, H, dtype=np.float32)
         if mode == "y_btt":
             w = w[::-1].copy()
-        return np.tile(w[:, None], (1, W))
+        out = np.tile(w[:, None], (1, W))
+    out.setflags(write=False)
+    return out
 
-def extract_scoring_strips(canvas: Image.Image, tile: Image.Image, mode: ExtendMode) -> tuple[Image.Image, Image.Image]:
-    canvas = canvas.convert("RGB")
-    tile = tile.convert("RGB")
-    w, h = canvas.size
+def _strip_boxes(canvas_size: tuple[int, int], mode: ExtendMode) -> tuple[tuple[int, int, int, int], tuple[int, int, int, int]]:
+    """
+    (canvas_box, tile_box) crop boxes for the strips scored by extract_scoring_strips.
+    """
+    w, h = canvas_size
 
     if mode in ("x_ltr", "x_rtl"):
         if h != TILE_PX: raise ValueError("canvas height must be TILE_PX")
         if mode == "x_ltr":
-            canvas_strip = canvas.crop((w - OVERLAP_PX, 0, w, TILE_PX))
-            tile_strip   = tile.crop((HALF_PX, 0, HALF_PX + OVERLAP_PX, TILE_PX))   # GENERATED side
-        else:
-            canvas_strip = canvas.crop((0, 0, OVERLAP_PX, TILE_PX))
-            tile_strip   = tile.crop((HALF_PX - OVERLAP_PX, 0, HALF_PX, TILE_PX))   # GENERATED side
-        return canvas_strip, tile_strip
+            return (w - OVERLAP_PX, 0, w, TILE_PX), (HALF_PX, 0, HALF_PX + OVERLAP_PX, TILE_PX)   # GENERATED side
+        return (0, 0, OVERLAP_PX, TILE_PX), (HALF_PX - OVERLAP_PX, 0, HALF_PX, TILE_PX)           # GENERATED side
 
     if mode in ("y_ttb", "y_btt"):
         if w != TILE_PX: raise ValueError("canvas width must be TILE_PX")
         if mode == "y_ttb":
-            canvas_strip = canvas.crop((0, h - OVERLAP_PX, TILE_PX, h))
-            tile_strip   = tile.crop((0, HALF_PX, TILE_PX, HALF_PX + OVERLAP_PX))   # GENERATED side
-        else:
-            canvas_strip = canvas.crop((0, 0, TILE_PX, OVERLAP_PX))
-            tile_strip   = tile.crop((0, HALF_PX - OVERLAP_PX, TILE_PX, HALF_PX))   # GENERATED side
-        return canvas_strip, tile_strip
+            return (0, h - OVERLAP_PX, TILE_PX, h), (0, HALF_PX, TILE_PX, HALF_PX + OVERLAP_PX)   # GENERATED side
+        return (0, 0, TILE_PX, OVERLAP_PX), (0, HALF_PX - OVERLAP_PX, TILE_PX, HALF_PX)           # GENERATED side
 
     raise ValueError(mode)
 
-def score_tile_sobel_corr(canvas: Image.Image, tile: Image.Image, mode: ExtendMode) -> float:
-    c_strip, t_strip = extract_scoring_strips(canvas, tile, mode)
-
-    c = _to_gray_f32(c_strip)
-    t = _to_gray_f32(t_strip)
-
-    c_edges = _sobel_mag(c)
-    t_edges = _sobel_mag(t)
+def _strip_arrays(canvas: Image.Image, tile: Image.Image, mode: ExtendMode) -> tuple[np.ndarray, np.ndarray]:
+    # Crop before converting: np.asarray on a PIL image materializes every pixel,
+    # and the canvas keeps growing while the strip stays OVERLAP_PX thick.
+    c_box, t_box = _strip_boxes(canvas.size, mode)
+    return np.asarray(_rgb(canvas.crop(c_box))), np.asarray(_rgb(tile.crop(t_box)))
 
-    w = _edge_weight(c_edges.shape, mode)
-
-    # weighted correlation (cosine similarity)
-    c_vec = (c_edges * w).ravel()
-    t_vec = (t_edges * w).ravel()
+def extract_scoring_strips(canvas: Image.Image, tile: Image.Image, mode: ExtendMode) -> tuple[Image.Image, Image.Image]:
+    c_box, t_box = _strip_boxes(canvas.size, mode)
+    return _rgb(canvas.crop(c_box)), _rgb(tile.crop(t_box))
 
-    denom = float(np.linalg.norm(c_vec) * np.linalg.norm(t_vec))
+def score_tile_sobel_corr(canvas: Image.Image, tile: Image.Image, mode: ExtendMode) -> float:
+    c_strip, t_strip = _strip_arrays(canvas, tile, mode)
+
+    # Both strips have the same shape; run gray + Sobel once over the (2, H, W) batch.
+    gray = _to_gray_f32(np.stack((c_strip, t_strip)))
+    c_edges, t_edges = _sobel_mag(gray)
+
+    w = _edge_weight(tuple(c_edges.shape), mode)
+
+    return _weighted_cosine(c_edges, t_edges, w)
+
+def _weighted_cosine(c_edges: np.ndarray, t_edges: np.ndarray, w: np.ndarray) -> float:
+    """
+    Cosine similarity of (c_edges * w) and (t_edges * w).
+
+    Weights are applied in place (both edge maps are scratch arrays owned by
+    the caller), then the three reductions run as BLAS dots over the same
+    contiguous buffers -- no weighted copies, no np.linalg.norm passes.
+    """
+    np.multiply(c_edges, w, out=c_edges)
+    np.multiply(t_edges, w, out=t_edges)
+    # np.dot on contiguous float32 vectors goes straight to BLAS sdot; make sure
+    # neither side is upcast or strided (both are no-ops on the normal path).
+    c_vec = np.ascontiguousarray(c_edges, dtype=np.float32).ravel()
+    t_vec = np.ascontiguousarray(t_edges, dtype=np.float32).ravel()
+
+    cc = float(np.dot(c_vec, c_vec))
+    tt = float(np.dot(t_vec, t_vec))
+    denom = float(np.sqrt(cc * tt))
     if denom == 0.0:
         return 0.0
-    return float(np.dot(c_vec, t_vec) / denom)
\ No newline at end of file
+    return float(np.dot(c_vec, t_vec)) / denom
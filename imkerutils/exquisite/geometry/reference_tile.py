@@ -1,9 +1,11 @@
 # imkerutils/exquisite/geometry/reference_tile.py
 from __future__ import annotations
 
+import functools
 import io
 from dataclasses import dataclass
 
+import numpy as np
 from PIL import Image
 
 from imkerutils.exquisite.geometry.tile_mode import (
@@ -19,15 +21,23 @@ class ReferenceTileAndMask:
     mask_rgba: Image.Image
 
 
-def encode_png_bytes(img: Image.Image) -> bytes:
+def encode_png_bytes(img: Image.Image, *, compress_level: int = 6) -> bytes:
     buf = io.BytesIO()
-    img.save(buf, format="PNG")
+    img.save(buf, format="PNG", compress_level=compress_level)
     return buf.getvalue()
 
 
-def _alpha_ramp_for_band(*, mode: ExtendMode, length: int) -> list[int]:
+def encode_webp_lossless_bytes(img: Image.Image) -> bytes:
+    # method=0 is the fastest lossless encoder setting; pixels are still exact.
+    buf = io.BytesIO()
+    img.save(buf, format="WEBP", lossless=True, method=0)
+    return buf.getvalue()
+
+
+@functools.lru_cache(maxsize=8)
+def _alpha_ramp_for_band(*, mode: ExtendMode, length: int) -> np.ndarray:
     """
-    Produce a 1D alpha ramp over the band thickness (length = 512).
+    Produce a 1D uint8 alpha ramp over the band thickness (length = 512).
 
     Semantics we assume (per your directive):
       - alpha=255 -> strongly "fix" / preserve
@@ -41,19 +51,77 @@ def _alpha_ramp_for_band(*, mode: ExtendMode, length: int) -> list[int]:
     For x_rtl: band x=512..1023, frontier at x=512     => 0   -> 255 (so within band coords 0..511: 0->255)
     For y_ttb: band y=0..511, frontier at y=511        => 255 -> 0
     For y_btt: band y=512..1023, frontier at y=512     => 0   -> 255
+
+    Cached per (mode, length); the returned array is read-only.
     """
     if length <= 1:
-        return [255]
+        ramp = np.full((1,), 255, dtype=np.uint8)
 
-    if mode in ("x_ltr", "y_ttb"):
+    elif mode in ("x_ltr", "y_ttb"):
         # 255 at far edge, 0 at frontier edge
-        return [int(round(255 * (1.0 - (i / (length - 1))))) for i in range(length)]
+        ramp = np.rint(np.linspace(255, 0, length, dtype=np.float32)).astype(np.uint8)
 
-    if mode in ("x_rtl", "y_btt"):
+    elif mode in ("x_rtl", "y_btt"):
         # 0 at frontier edge, 255 at far edge
-        return [int(round(255 * (i / (length - 1)))) for i in range(length)]
+        ramp = np.rint(np.linspace(0, 255, length, dtype=np.float32)).astype(np.uint8)
+
+    else:
+        raise ValueError(mode)
+
+    ramp.setflags(write=False)
+    return ramp
+
+
+@dataclass(frozen=True)
+class _BandGeom:
+    band_size: tuple[int, int]  # expected conditioning_band (w, h)
+    region: tuple[slice, slice]  # band region in tile coords, as (rows, cols)
+    ramp_along_x: bool
+
+
+_X_BAND = (BAND_PX, TILE_PX)
+_Y_BAND = (TILE_PX, BAND_PX)
+_ALL = slice(None)
+
+# Per-mode band geometry:
+#   x_ltr: band occupies left half [0..511], frontier at x=511
+#   x_rtl: band occupies right half [512..1023], frontier at x=512
+#   y_ttb: band occupies top half [0..511], frontier at y=511
+#   y_btt: band occupies bottom half [512..1023], frontier at y=512
+_MODE_TABLE: dict[str, _BandGeom] = {
+    "x_ltr": _BandGeom(_X_BAND, (_ALL, slice(0, BAND_PX)), True),
+    "x_rtl": _BandGeom(_X_BAND, (_ALL, slice(TILE_PX - BAND_PX, TILE_PX)), True),
+    "y_ttb": _BandGeom(_Y_BAND, (slice(0, BAND_PX), _ALL), False),
+    "y_btt": _BandGeom(_Y_BAND, (slice(TILE_PX - BAND_PX, TILE_PX), _ALL), False),
+}
+
+
+@functools.lru_cache(maxsize=4)
+def _mask_template(mode: ExtendMode) -> Image.Image:
+    """
+    The Convention B mask for `mode`, built once and cached.
+
+    Alpha is 0 (free) everywhere except the band region, which carries the
+    fix->free ramp from _alpha_ramp_for_band. Callers must copy() before use.
+    """
+    geom = _MODE_TABLE[mode]
+    ramp = _alpha_ramp_for_band(mode=mode, length=BAND_PX)  # length 512
 
-    raise ValueError(mode)
+    # RGB channels of the mask are unused (always 0); only alpha carries meaning.
+    rgba = np.zeros((TILE_PX, TILE_PX, 4), dtype=np.uint8)
+    rgba[(*geom.region, 3)] = ramp[None, :] if geom.ramp_along_x else ramp[:, None]
+    return Image.fromarray(rgba, mode="RGBA")
+
+
+@functools.lru_cache(maxsize=16)
+def encode_mask_png_bytes(mode: ExtendMode, *, compress_level: int = 6) -> bytes:
+    """
+    PNG bytes of the Convention B mask for `mode`.
+
+    The mask depends only on mode, so it is encoded once per
+    (mode, compress_level) rather than once per upload.
+    """
+    return encode_png_bytes(_mask_template(mode), compress_level=compress_level)
 
 
 def build_reference_tile_and_mask(
@@ -72,60 +140,24 @@ def build_reference_tile_and_mask(
 
     IMPORTANT: This assumes intermediate alpha values (0..255) have meaning.
     """
-    band = conditioning_band.convert("RGB")
-
-    if mode in ("x_ltr", "x_rtl"):
-        if band.size != (BAND_PX, TILE_PX):
-            raise ValueError(f"conditioning_band wrong size: got {band.size}, expected {(BAND_PX, TILE_PX)}")
-    else:
-        if band.size != (TILE_PX, BAND_PX):
-            raise ValueError(f"conditioning_band wrong size: got {band.size}, expected {(TILE_PX, BAND_PX)}")
-
-    # Reference canvas (RGB)
-    ref = Image.new("RGB", (TILE_PX, TILE_PX), background_rgb)
-
-    # Mask canvas (RGBA): start fully editable everywhere (alpha=0)
-    # We'll write a ramp ONLY in the band region.
-    mask = Image.new("RGBA", (TILE_PX, TILE_PX), (0, 0, 0, 0))
-    r, g, b, a = mask.split()
-
-    if mode in ("x_ltr", "x_rtl"):
-        ramp = _alpha_ramp_for_band(mode=mode, length=BAND_PX)  # length 512
-        # Build alpha image for the band: size (512, 1024)
-        a_band = Image.new("L", (BAND_PX, TILE_PX), 0)
-        # Fill columnwise using ramp
-        # Data order for putdata is row-major; easiest is build a full list.
-        pixels: list[int] = []
-        for _y in range(TILE_PX):
-            pixels.extend(ramp)
-        a_band.putdata(pixels)
-
-        if mode == "x_ltr":
-            # band occupies left half [0..511], frontier at x=511
-            ref.paste(band, (0, 0))
-            a.paste(a_band, (0, 0))
-        else:
-            # x_rtl: band occupies right half [512..1023], frontier at x=512
-            ref.paste(band, (TILE_PX - BAND_PX, 0))
-            a.paste(a_band, (TILE_PX - BAND_PX, 0))
-
+    geom = _MODE_TABLE.get(mode)
+    if geom is None:
+        raise ValueError(mode)
+
+    band = conditioning_band if conditioning_band.mode == "RGB" else conditioning_band.convert("RGB")
+    if band.size != geom.band_size:
+        raise ValueError(f"conditioning_band wrong size: got {band.size}, expected {geom.band_size}")
+
+    # Reference canvas (RGB), assembled as an array: one fill + one band copy.
+    # The default black background comes pre-zeroed from the allocator.
+    if background_rgb == (0, 0, 0):
+        ref_np = np.zeros((TILE_PX, TILE_PX, 3), dtype=np.uint8)
     else:
-        ramp = _alpha_ramp_for_band(mode=mode, length=BAND_PX)  # length 512
-        # Build alpha image for the band: size (1024, 512)
-        a_band = Image.new("L", (TILE_PX, BAND_PX), 0)
-        pixels = []
-        for y in range(BAND_PX):
-            pixels.extend([ramp[y]] * TILE_PX)
-        a_band.putdata(pixels)
-
-        if mode == "y_ttb":
-            # band occupies top half [0..511], frontier at y=511
-            ref.paste(band, (0, 0))
-            a.paste(a_band, (0, 0))
-        else:
-            # y_btt: band occupies bottom half [512..1023], frontier at y=512
-            ref.paste(band, (0, TILE_PX - BAND_PX))
-            a.paste(a_band, (0, TILE_PX - BAND_PX))
-
-    mask_rgba = Image.merge("RGBA", (r, g, b, a))
-    return ReferenceTileAndMask(reference_tile_rgb=ref, mask_rgba=mask_rgba)
\ No newline at end of file
+        ref_np = np.empty((TILE_PX, TILE_PX, 3), dtype=np.uint8)
+        ref_np[...] = background_rgb
+    ref_np[geom.region] = np.asarray(band)
+
+    ref = Image.fromarray(ref_np, mode="RGB")
+    # The mask depends only on mode; hand out a private copy of the template.
+    mask = _mask_template(mode).copy()
+    return ReferenceTileAndMask(reference_tile_rgb=ref, mask_rgba=mask)
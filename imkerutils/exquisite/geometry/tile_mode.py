@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Literal, Tuple
+from typing import Callable, Literal, Tuple, overload
 
+import numpy as np
 from PIL import Image
 
 ExtendMode = Literal["x_ltr", "x_rtl", "y_ttb", "y_btt"]
@@ -39,6 +40,13 @@ PATCH_PX = OVERLAP_PX + ADVANCE_PX  # 1024
 # Backward-compatible name: ext_px means "advance per step".
 EXT_PX = ADVANCE_PX
 
+# Patch bounds along the growth axis, in tile coordinates. Fixed by the constants
+# above, so validate them here once instead of on every glue.
+_PATCH_A = HALF_PX - OVERLAP_PX  # 0
+_PATCH_B = HALF_PX + ADVANCE_PX  # 1024
+if _PATCH_A != 0 or _PATCH_B != TILE_PX:
+    raise AssertionError(f"Unexpected patch bounds a={_PATCH_A}, b={_PATCH_B}, expected a=0, b={TILE_PX}")
+
 
 @dataclass(frozen=True)
 class TileModeSpec:
@@ -54,7 +62,54 @@ def _require_rgb(img: Image.Image) -> Image.Image:
     return img if img.mode == "RGB" else img.convert("RGB")
 
 
-def extract_conditioning_band(canvas: Image.Image, mode: ExtendMode) -> Image.Image:
+_Box = Tuple[int, int, int, int]
+
+# Per-mode geometry, looked up once per call instead of walking an if/elif chain.
+# Band boxes depend on the canvas size (w, h); split boxes are fixed.
+_BAND_BOX: dict[str, Callable[[int, int], _Box]] = {
+    "x_ltr": lambda w, h: (w - BAND_PX, 0, w, h),   # rightmost
+    "x_rtl": lambda w, h: (0, 0, BAND_PX, h),       # leftmost
+    "y_ttb": lambda w, h: (0, h - BAND_PX, w, h),   # bottom
+    "y_btt": lambda w, h: (0, 0, w, BAND_PX),       # top
+}
+
+_LEFT: _Box = (0, 0, HALF_PX, TILE_PX)
+_RIGHT: _Box = (HALF_PX, 0, TILE_PX, TILE_PX)
+_TOP: _Box = (0, 0, TILE_PX, HALF_PX)
+_BOTTOM: _Box = (0, HALF_PX, TILE_PX, TILE_PX)
+
+# mode -> (cond_half box, new_half box)
+_SPLIT_BOXES: dict[str, tuple[_Box, _Box]] = {
+    "x_ltr": (_LEFT, _RIGHT),
+    "x_rtl": (_RIGHT, _LEFT),
+    "y_ttb": (_TOP, _BOTTOM),
+    "y_btt": (_BOTTOM, _TOP),
+}
+
+# mode -> (w, h) -> (out size, canvas paste xy, tile paste xy)
+_GLUE_PLAN: dict[str, Callable[[int, int], tuple[tuple[int, int], tuple[int, int], tuple[int, int]]]] = {
+    "x_ltr": lambda w, h: ((w + ADVANCE_PX, h), (0, 0), (w - OVERLAP_PX, 0)),
+    "x_rtl": lambda w, h: ((w + ADVANCE_PX, h), (ADVANCE_PX, 0), (0, 0)),
+    "y_ttb": lambda w, h: ((w, h + ADVANCE_PX), (0, 0), (0, h - OVERLAP_PX)),
+    "y_btt": lambda w, h: ((w, h + ADVANCE_PX), (0, ADVANCE_PX), (0, 0)),
+}
+
+
+def _check_non_growing_axis(mode: str, w: int, h: int) -> None:
+    if mode[0] == "x":
+        if h != TILE_PX:
+            raise ValueError(f"Phase A requires canvas height == {TILE_PX}, got {h}")
+    elif w != TILE_PX:
+        raise ValueError(f"Phase A requires canvas width == {TILE_PX}, got {w}")
+
+
+@overload
+def extract_conditioning_band(canvas: Image.Image, mode: ExtendMode, *, as_ndarray: Literal[False] = ...) -> Image.Image: ...
+@overload
+def extract_conditioning_band(canvas: Image.Image, mode: ExtendMode, *, as_ndarray: Literal[True]) -> np.ndarray: ...
+
+
+def extract_conditioning_band(canvas: Image.Image, mode: ExtendMode, *, as_ndarray: bool = False) -> Image.Image | np.ndarray:
     """
     Extract the extremal 512px strip from the current canvas.
 
@@ -62,43 +117,32 @@ def extract_conditioning_band(canvas: Image.Image, mode: ExtendMode) -> Image.Im
     x_rtl: leftmost  512px of canvas
     y_ttb: bottom    512px of canvas
     y_btt: top       512px of canvas
+
+    as_ndarray=True returns the band as a read-only, C-contiguous (h, w, 3)
+    uint8 array for callers that feed pixels straight into a model. Only the
+    band is converted, never the whole canvas.
     """
     canvas = _require_rgb(canvas)
     w, h = canvas.size
 
-    if mode in ("x_ltr", "x_rtl"):
-        if h != TILE_PX:
-            raise ValueError(f"Phase A requires canvas height == {TILE_PX}, got {h}")
+    band_box = _BAND_BOX.get(mode)
+    if band_box is None:
+        raise ValueError(f"Unknown mode: {mode}")
+
+    _check_non_growing_axis(mode, w, h)
+    if mode[0] == "x":
         if w < BAND_PX:
             raise ValueError(f"Canvas width {w} too small for band {BAND_PX}")
-
-        if mode == "x_ltr":
-            box = (w - BAND_PX, 0, w, h)  # rightmost
-        else:
-            box = (0, 0, BAND_PX, h)      # leftmost
-
-        band = canvas.crop(box)
-        if band.size != (BAND_PX, TILE_PX):
-            raise AssertionError(f"Band size mismatch: {band.size}")
-        return band
-
-    if mode in ("y_ttb", "y_btt"):
-        if w != TILE_PX:
-            raise ValueError(f"Phase A requires canvas width == {TILE_PX}, got {w}")
+        expected = (BAND_PX, TILE_PX)
+    else:
         if h < BAND_PX:
             raise ValueError(f"Canvas height {h} too small for band {BAND_PX}")
+        expected = (TILE_PX, BAND_PX)
 
-        if mode == "y_ttb":
-            box = (0, h - BAND_PX, w, h)  # bottom
-        else:
-            box = (0, 0, w, BAND_PX)      # top
-
-        band = canvas.crop(box)
-        if band.size != (TILE_PX, BAND_PX):
-            raise AssertionError(f"Band size mismatch: {band.size}")
-        return band
-
-    raise ValueError(f"Unknown mode: {mode}")
+    band = canvas.crop(band_box(w, h))
+    if band.size != expected:
+        raise AssertionError(f"Band size mismatch: {band.size}")
+    return np.asarray(band) if as_ndarray else band
 
 
 def split_tile(tile: Image.Image, mode: ExtendMode) -> Tuple[Image.Image, Image.Image]:
@@ -113,27 +157,12 @@ def split_tile(tile: Image.Image, mode: ExtendMode) -> Tuple[Image.Image, Image.
     if tile.size != (TILE_PX, TILE_PX):
         raise ValueError(f"Tile must be {TILE_PX}x{TILE_PX}, got {tile.size}")
 
-    if mode == "x_ltr":
-        cond = tile.crop((0, 0, HALF_PX, TILE_PX))          # left half
-        new = tile.crop((HALF_PX, 0, TILE_PX, TILE_PX))     # right half
-        return cond, new
-
-    if mode == "x_rtl":
-        new = tile.crop((0, 0, HALF_PX, TILE_PX))           # left half
-        cond = tile.crop((HALF_PX, 0, TILE_PX, TILE_PX))    # right half
-        return cond, new
-
-    if mode == "y_ttb":
-        cond = tile.crop((0, 0, TILE_PX, HALF_PX))          # top half
-        new = tile.crop((0, HALF_PX, TILE_PX, TILE_PX))     # bottom half
-        return cond, new
-
-    if mode == "y_btt":
-        new = tile.crop((0, 0, TILE_PX, HALF_PX))           # top half
-        cond = tile.crop((0, HALF_PX, TILE_PX, TILE_PX))    # bottom half
-        return cond, new
+    boxes = _SPLIT_BOXES.get(mode)
+    if boxes is None:
+        raise ValueError(f"Unknown mode: {mode}")
 
-    raise ValueError(f"Unknown mode: {mode}")
+    cond_box, new_box = boxes
+    return tile.crop(cond_box), tile.crop(new_box)
 
 
 def _tile_patch_for_overlap_glue(tile: Image.Image, mode: ExtendMode) -> Image.Image:
@@ -149,12 +178,7 @@ def _tile_patch_for_overlap_glue(tile: Image.Image, mode: ExtendMode) -> Image.I
     if tile.size != (TILE_PX, TILE_PX):
         raise ValueError(f"Tile must be {TILE_PX}x{TILE_PX}, got {tile.size}")
 
-    a = HALF_PX - OVERLAP_PX  # 0
-    b = HALF_PX + ADVANCE_PX  # 1024
-    if a != 0 or b != TILE_PX:
-        raise AssertionError(f"Unexpected patch bounds a={a}, b={b}, expected a=0, b={TILE_PX}")
-
-    # Patch is the full tile for all modes.
+    # Patch is the full tile for all modes (bounds checked once at import).
     return tile
 
 
@@ -180,39 +204,16 @@ def glue(canvas: Image.Image, tile: Image.Image, mode: ExtendMode) -> Image.Imag
     tile = _require_rgb(tile)
     w, h = canvas.size
 
-    if mode in ("x_ltr", "x_rtl"):
-        if h != TILE_PX:
-            raise ValueError(f"Phase A requires canvas height == {TILE_PX}, got {h}")
-
-        out = Image.new("RGB", (w + ADVANCE_PX, h))
-
-        if mode == "x_ltr":
-            out.paste(canvas, (0, 0))
-            paste_x = w - OVERLAP_PX  # w - 512
-            out.paste(tile, (paste_x, 0))
-        else:
-            out.paste(canvas, (ADVANCE_PX, 0))
-            out.paste(tile, (0, 0))
-
-        return out
-
-    if mode in ("y_ttb", "y_btt"):
-        if w != TILE_PX:
-            raise ValueError(f"Phase A requires canvas width == {TILE_PX}, got {w}")
-
-        out = Image.new("RGB", (w, h + ADVANCE_PX))
-
-        if mode == "y_ttb":
-            out.paste(canvas, (0, 0))
-            paste_y = h - OVERLAP_PX  # h - 512
-            out.paste(tile, (0, paste_y))
-        else:
-            out.paste(canvas, (0, ADVANCE_PX))
-            out.paste(tile, (0, 0))
-
-        return out
+    plan = _GLUE_PLAN.get(mode)
+    if plan is None:
+        raise ValueError(f"Unknown mode: {mode}")
+    _check_non_growing_axis(mode, w, h)
 
-    raise ValueError(f"Unknown mode: {mode}")
+    out_size, canvas_xy, tile_xy = plan(w, h)
+    out = Image.new("RGB", out_size)
+    out.paste(canvas, canvas_xy)
+    out.paste(tile, tile_xy)
+    return out
 
 
 def expected_next_canvas_size(canvas: Image.Image, mode: ExtendMode) -> tuple[int, int]:
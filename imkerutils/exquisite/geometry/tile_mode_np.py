@@ -0,0 +1,285 @@
+# imkerutils/exquisite/geometry/tile_mode_np.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+from PIL import Image
+
+from imkerutils.exquisite.geometry.tile_mode import (
+    ExtendMode,
+    TILE_PX,
+    HALF_PX,
+    BAND_PX,
+    OVERLAP_PX,
+    ADVANCE_PX,
+    _PATCH_A,
+    _PATCH_B,
+    _require_rgb,
+)
+
+# ndarray counterparts of tile_mode's geometry functions.
+#
+# Arrays are (H, W, 3) uint8, row-major, i.e. np.asarray(rgb_image). Results are
+# pixel-identical to the Pillow versions. Keep pixels in this form across a
+# session and convert only at I/O boundaries: on a growing canvas, one
+# PIL <-> ndarray round trip costs more than the Pillow paste it would replace.
+
+
+# mode -> (growth axis in (H, W, 3) arrays, direction): +1 grows away from index 0
+# (the band sits at the far end), -1 grows toward it (the band sits at index 0).
+_MODE_DECODE: dict[str, tuple[int, int]] = {
+    "x_ltr": (1, +1),
+    "x_rtl": (1, -1),
+    "y_ttb": (0, +1),
+    "y_btt": (0, -1),
+}
+
+_AXIS_NAME = ("height", "width")
+
+
+def rgb_array(img: Image.Image) -> np.ndarray:
+    """
+    (H, W, 3) uint8 pixels of `img`. RGBA is read as-is and viewed as its first
+    three channels (convert("RGB") drops alpha the same way), which skips the
+    intermediate RGB image.
+    """
+    if img.mode == "RGBA":
+        return np.asarray(img)[..., :3]
+    return np.asarray(_require_rgb(img))
+
+
+def _decode(mode: ExtendMode) -> tuple[int, int]:
+    try:
+        return _MODE_DECODE[mode]
+    except KeyError:
+        raise ValueError(f"Unknown mode: {mode}") from None
+
+
+def _ix(axis: int, s: slice) -> tuple[slice, ...]:
+    # Index selecting `s` along `axis` (0 = rows, 1 = columns).
+    return (slice(None), s) if axis else (s,)
+
+
+def _check_canvas(canvas: np.ndarray, axis: int) -> int:
+    """Validate the non-growing dimension; return the length along `axis`."""
+    fixed = canvas.shape[1 - axis]
+    if fixed != TILE_PX:
+        raise ValueError(f"Phase A requires canvas {_AXIS_NAME[1 - axis]} == {TILE_PX}, got {fixed}")
+    return canvas.shape[axis]
+
+
+def extract_conditioning_band(canvas: np.ndarray, mode: ExtendMode) -> np.ndarray:
+    """
+    tile_mode.extract_conditioning_band on arrays. Returns a view into `canvas`.
+    """
+    axis, sign = _decode(mode)
+    n = _check_canvas(canvas, axis)
+    if n < BAND_PX:
+        raise ValueError(f"Canvas {_AXIS_NAME[axis]} {n} too small for band {BAND_PX}")
+    return canvas[_ix(axis, slice(n - BAND_PX, n) if sign > 0 else slice(0, BAND_PX))]
+
+
+def decompose_tile(tile: np.ndarray, mode: ExtendMode) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (cond_half, new_half, glue_patch) for a tile, all views into `tile` -- the
+    split_tile halves and the _tile_patch_for_overlap_glue patch from one pass.
+
+    The patch spans HALF_PX - OVERLAP_PX .. HALF_PX + ADVANCE_PX, i.e. the full
+    tile under the current contract.
+    """
+    axis, sign = _decode(mode)
+    if tile.shape[:2] != (TILE_PX, TILE_PX):
+        raise ValueError(f"Tile must be {TILE_PX}x{TILE_PX}, got {tile.shape[1::-1]}")
+
+    near, far = tile[_ix(axis, slice(None, HALF_PX))], tile[_ix(axis, slice(HALF_PX, None))]
+    cond, new = (near, far) if sign > 0 else (far, near)
+    return cond, new, tile[_ix(axis, slice(_PATCH_A, _PATCH_B))]
+
+
+def split_tile(tile: np.ndarray, mode: ExtendMode) -> tuple[np.ndarray, np.ndarray]:
+    """
+    tile_mode.split_tile on arrays: (cond_half, new_half), both views into `tile`.
+    """
+    cond, new, _patch = decompose_tile(tile, mode)
+    return cond, new
+
+
+def _paste(out: np.ndarray, src: np.ndarray, x: int, y: int) -> None:
+    """
+    out[y:y+h, x:x+w] = src, clipped to out's bounds exactly like Image.paste(src, (x, y)).
+    """
+    H, W = out.shape[:2]
+    h, w = src.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, W), min(y + h, H)
+    if x1 > x0 and y1 > y0:
+        np.copyto(out[y0:y1, x0:x1], src[y0 - y:y1 - y, x0 - x:x1 - x])
+
+
+def _paste_along(out: np.ndarray, src: np.ndarray, axis: int, offset: int) -> None:
+    if axis:
+        _paste(out, src, offset, 0)
+    else:
+        _paste(out, src, 0, offset)
+
+
+def glue(canvas: np.ndarray, tile: np.ndarray, mode: ExtendMode) -> np.ndarray:
+    """
+    tile_mode.glue on arrays: one output allocation, two np.copyto block copies.
+    """
+    axis, sign = _decode(mode)
+    n = _check_canvas(canvas, axis)
+
+    out_shape = list(canvas.shape)
+    out_shape[axis] += ADVANCE_PX
+
+    # A full tile always covers the grown region; anything smaller leaves black
+    # (Image.new default) where neither canvas nor tile lands.
+    if tile.shape[:2] == (TILE_PX, TILE_PX):
+        out = np.empty(out_shape, dtype=np.uint8)
+    else:
+        out = np.zeros(out_shape, dtype=np.uint8)
+
+    if sign > 0:
+        np.copyto(out[_ix(axis, slice(None, n))], canvas)
+        _paste_along(out, tile, axis, n - OVERLAP_PX)   # n - 512
+    else:
+        np.copyto(out[_ix(axis, slice(ADVANCE_PX, None))], canvas)
+        _paste_along(out, tile, axis, 0)
+
+    return out
+
+
+def expected_next_canvas_size(canvas: np.ndarray, mode: ExtendMode) -> tuple[int, int]:
+    axis, _sign = _decode(mode)
+    h, w = canvas.shape[:2]
+    return (w + ADVANCE_PX, h) if axis else (w, h + ADVANCE_PX)
+
+
+@dataclass(eq=False)
+class CanvasView:
+    """
+    A canvas decoded once into an RGB array, so band extraction and glue within
+    a step read the same pixel buffer instead of each going through Pillow.
+
+    RGB-ness is checked once, when the view is built; nothing downstream
+    re-validates the mode. The Image form is materialized lazily (and kept) for
+    code that still wants one.
+    """
+    arr: np.ndarray
+    _img: Image.Image | None = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        a = self.arr
+        if a.dtype != np.uint8 or a.ndim != 3 or a.shape[2] != 3:
+            raise ValueError(f"CanvasView needs an (H, W, 3) uint8 array, got {a.dtype} {a.shape}")
+
+    @classmethod
+    def from_image(cls, img: Image.Image) -> "CanvasView":
+        return cls(rgb_array(img), img if img.mode == "RGB" else None)
+
+    @property
+    def size(self) -> tuple[int, int]:
+        h, w = self.arr.shape[:2]
+        return (w, h)
+
+    @property
+    def image(self) -> Image.Image:
+        if self._img is None:
+            self._img = Image.fromarray(self.arr, mode="RGB")
+        return self._img
+
+    def band(self, mode: ExtendMode) -> np.ndarray:
+        return extract_conditioning_band(self.arr, mode)
+
+    def glue(self, tile: np.ndarray | Image.Image, mode: ExtendMode) -> "CanvasView":
+        # Generators hand back Images; convert those once here. Arrays are taken as RGB.
+        if isinstance(tile, Image.Image):
+            tile = rgb_array(tile)
+        return CanvasView(glue(self.arr, tile, mode))
+
+
+class RollingCanvas:
+    """
+    A canvas that grows in place inside one buffer sized for `max_steps` glues.
+
+    glue() allocates a new, larger canvas every step, so an N-step session
+    allocates and copies O(N^2) bytes. Here the buffer is allocated once and
+    each step only writes the tile; `arr` is a view of the live region.
+
+    x_ltr / y_ttb grow away from the buffer's start; x_rtl / y_btt are anchored
+    at the buffer's far end and grow backward, so existing pixels never move.
+    """
+
+    def __init__(self, initial: np.ndarray, mode: ExtendMode, *, max_steps: int) -> None:
+        if max_steps < 0:
+            raise ValueError(f"max_steps must be >= 0, got {max_steps}")
+        self.mode = mode
+        self.max_steps = max_steps
+        self.steps = 0
+
+        axis, sign = _decode(mode)
+        self._axis = axis
+        self._len = _check_canvas(initial, axis)
+        self._backward = sign < 0
+
+        shape = list(initial.shape)
+        shape[axis] += max_steps * ADVANCE_PX
+        self.buf = np.empty(shape, dtype=np.uint8)
+        self._cap = shape[axis]
+        np.copyto(self._span(self._len), initial)
+
+    def _span(self, n: int) -> np.ndarray:
+        # The live region of length n along the growth axis.
+        lo, hi = (self._cap - n, self._cap) if self._backward else (0, n)
+        return self.buf[_ix(self._axis, slice(lo, hi))]
+
+    @property
+    def arr(self) -> np.ndarray:
+        return self._span(self._len)
+
+    @property
+    def size(self) -> tuple[int, int]:
+        h, w = self.arr.shape[:2]
+        return (w, h)
+
+    def band(self) -> np.ndarray:
+        return extract_conditioning_band(self.arr, self.mode)
+
+    def glue_inplace(self, tile: np.ndarray) -> None:
+        """
+        Same pixels as glue(self.arr, tile, self.mode), written into the buffer.
+        """
+        if self.steps >= self.max_steps:
+            raise ValueError(f"RollingCanvas is full ({self.max_steps} steps)")
+
+        n = self._len
+        out = self._span(n + ADVANCE_PX)
+
+        if tile.shape[:2] != (TILE_PX, TILE_PX):
+            # Partial tiles leave glue()'s black fill where they don't land.
+            fresh = slice(None, ADVANCE_PX) if self._backward else slice(n, None)
+            out[_ix(self._axis, fresh)] = 0
+
+        _paste_along(out, tile, self._axis, 0 if self._backward else n - OVERLAP_PX)
+
+        self._len = n + ADVANCE_PX
+        self.steps += 1
+
+    def image(self) -> Image.Image:
+        return Image.fromarray(self.arr, mode="RGB")
+
+
+def glue_sequence(initial: np.ndarray, tiles: list[np.ndarray], mode: ExtendMode) -> np.ndarray:
+    """
+    Result of folding glue() over `tiles`, with the final canvas allocated once
+    and each tile written straight into it (O(K) bytes moved instead of O(K^2)).
+
+    Tiles are written in order, since each one's overlap overwrites the
+    previous tile's trailing edge.
+    """
+    rc = RollingCanvas(initial, mode, max_steps=len(tiles))
+    for t in tiles:
+        rc.glue_inplace(t)
+    return rc.buf
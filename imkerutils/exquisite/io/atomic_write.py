@@ -2,20 +2,39 @@
 from __future__ import annotations
 
 import os
+import shutil
 import tempfile
+import threading
 from pathlib import Path
-from typing import Callable, Union
+from typing import Callable, Iterable, Optional, Union
 
 
 PathLike = Union[str, Path]
+BytesLike = Union[bytes, bytearray, memoryview]
 
+_WRITE_CHUNK = 1 << 20  # 1 MiB
 
-def _fsync_dir(dirpath: Path) -> None:
+# Linux: O_TMPFILE creates an unnamed inode that only gets a name via linkat,
+# so a failed write leaves nothing behind in the directory.
+_O_TMPFILE = getattr(os, "O_TMPFILE", None) if os.path.isdir("/proc/self/fd") else None
+
+
+
+def _split(path: PathLike) -> tuple[str, str, str]:
+    """(path, parent, name) as plain strings; creates the parent directory."""
+    path = os.fspath(path)
+    parent, name = os.path.split(path)
+    parent = parent or "."
+    os.makedirs(parent, exist_ok=True)
+    return path, parent, name
+
+
+def _fsync_dir(dirpath: str) -> None:
     """
     Best-effort directory fsync for durability. On macOS this usually works.
     """
     try:
-        fd = os.open(str(dirpath), os.O_RDONLY)
+        fd = os.open(dirpath, os.O_RDONLY)
     except OSError:
         return
     try:
@@ -29,59 +48,276 @@ def _fsync_dir(dirpath: Path) -> None:
             pass
 
 
-def atomic_write_bytes(path: PathLike, data: bytes) -> None:
+def _fsync_file(path: str) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class DeferredFsync:
+    """
+    A batch of writes whose fsyncs are deferred to flush(): pass it as
+    `durable=batch`. Each caller owns its batch, so one caller's flush() never
+    takes (or races) another's files. Safe to add to from several threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._files: set[str] = set()
+        self._dirs: set[str] = set()
+
+    def add(self, dst: str, parent: str) -> None:
+        with self._lock:
+            self._files.add(dst)
+            self._dirs.add(parent)
+
+    def flush(self) -> None:
+        """
+        fsync every file added since the last flush once, then each distinct
+        parent directory once. The lock is held until the fsyncs finish, so a
+        concurrent flush() of the same batch returns only once they're done.
+        """
+        with self._lock:
+            for f in self._files:
+                _fsync_file(f)
+            for d in self._dirs:
+                _fsync_dir(d)
+            self._files.clear()
+            self._dirs.clear()
+
+
+# durable=False writes land here, for flush_pending().
+_DEFAULT_BATCH = DeferredFsync()
+
+Durability = Union[bool, DeferredFsync]
+
+
+def _batch_for(durable: Durability) -> Optional[DeferredFsync]:
+    """None to fsync immediately; otherwise the batch the fsyncs are deferred to."""
+    if durable is True:
+        return None
+    if durable is False:
+        return _DEFAULT_BATCH
+    return durable
+
+
+def flush_pending() -> None:
+    """
+    fsync everything written with durable=False since the last flush. Writes
+    made with a caller's own DeferredFsync are flushed by that batch instead.
+    """
+    _DEFAULT_BATCH.flush()
+
+
+def _write_all(f, data: Union[BytesLike, Iterable[bytes]]) -> None:
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        # Slice a memoryview so large buffers go out in bounded writes without copies.
+        mv = memoryview(data).cast("B")
+        for i in range(0, len(mv), _WRITE_CHUNK):
+            f.write(mv[i:i + _WRITE_CHUNK])
+    else:
+        # Streamed producers (e.g. an encoder yielding chunks): never hold the whole file.
+        for chunk in data:
+            f.write(chunk)
+
+
+def _write_unnamed(
+    dst: str, parent: str, name: str, data: Union[BytesLike, Iterable[bytes]], batch: Optional[DeferredFsync]
+) -> bool:
+    """
+    O_TMPFILE write path. Returns False (having written nothing) if the
+    filesystem can't do it, so the caller falls back to a named temp file.
+
+    One directory fd serves the unnamed open, the linkat, the rename and the
+    directory fsync.
+    """
+    try:
+        dir_fd = os.open(parent, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return False
+    try:
+        try:
+            fd = os.open(".", _O_TMPFILE | os.O_WRONLY, 0o600, dir_fd=dir_fd)
+        except OSError:
+            # filesystem without O_TMPFILE support (or older kernel)
+            return False
+
+        tmp_name = f"{name}.{os.urandom(6).hex()}.tmp"
+        with os.fdopen(fd, "wb") as f:
+            _write_all(f, data)
+            f.flush()
+            if batch is None:
+                os.fsync(f.fileno())
+            # Passing dst_dir_fd makes os.link use linkat(AT_SYMLINK_FOLLOW), which
+            # resolves the /proc magic link to the unnamed inode.
+            os.link(f"/proc/self/fd/{f.fileno()}", tmp_name, dst_dir_fd=dir_fd)
+
+        try:
+            os.replace(tmp_name, name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+        except BaseException:
+            try:
+                os.unlink(tmp_name, dir_fd=dir_fd)
+            except OSError:
+                pass
+            raise
+
+        if batch is None:
+            try:
+                os.fsync(dir_fd)
+            except OSError:
+                pass
+        else:
+            batch.add(dst, parent)
+        return True
+    finally:
+        os.close(dir_fd)
+
+
+def atomic_write_bytes(path: PathLike, data: Union[BytesLike, Iterable[bytes]], *, durable: Durability = True) -> None:
     """
-    Atomically replace `path` with `data`:
+    Atomically replace `path` with `data` (a bytes-like object, or an iterable
+    of byte chunks written as they arrive):
       - write temp file in same directory
       - fsync temp
       - os.replace into place
       - fsync directory (best-effort)
+
+    With durable=False the rename is still atomic but both fsyncs are deferred
+    to flush_pending(), so a batch of writes pays for them once at the end;
+    durable=<DeferredFsync> defers them to that batch's flush() instead.
     """
-    dst = Path(path)
-    dst.parent.mkdir(parents=True, exist_ok=True)
+    dst, parent, name = _split(path)
+    batch = _batch_for(durable)
 
-    with tempfile.NamedTemporaryFile(dir=str(dst.parent), prefix=dst.name + ".", suffix=".tmp", delete=False) as f:
-        tmp_path = Path(f.name)
-        f.write(data)
-        f.flush()
-        os.fsync(f.fileno())
+    if _O_TMPFILE is not None and _write_unnamed(dst, parent, name, data, batch):
+        return
+
+    fd, tmp_path = tempfile.mkstemp(dir=parent, prefix=name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            _write_all(f, data)
+            f.flush()
+            if batch is None:
+                os.fsync(f.fileno())
+    except BaseException:
+        # a streamed producer can fail midway; don't leave the temp behind
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
     os.replace(tmp_path, dst)
-    _fsync_dir(dst.parent)
+    if batch is None:
+        _fsync_dir(parent)
+    else:
+        batch.add(dst, parent)
 
 
-def atomic_write_text(path: PathLike, text: str, encoding: str = "utf-8") -> None:
-    atomic_write_bytes(path, text.encode(encoding))
+def atomic_write_text(path: PathLike, text: str, encoding: str = "utf-8", *, durable: Durability = True) -> None:
+    atomic_write_bytes(path, text.encode(encoding), durable=durable)
 
 
-def atomic_write_with(path: PathLike, writer: Callable[[Path], None]) -> None:
+def atomic_write_with(path: PathLike, writer: Callable[[Path], None], *, durable: Durability = True) -> None:
     """
     Atomically write a file produced by `writer(tmp_path)` into `path`.
     Useful for Pillow Image.save or other "write to filename" APIs.
+
+    durable=False (or a DeferredFsync) defers the fsyncs, as in atomic_write_bytes.
     """
-    dst = Path(path)
-    dst.parent.mkdir(parents=True, exist_ok=True)
+    dst, parent, name = _split(path)
+    batch = _batch_for(durable)
 
-    with tempfile.NamedTemporaryFile(dir=str(dst.parent), prefix=dst.name + ".", suffix=".tmp", delete=False) as f:
-        tmp_path = Path(f.name)
+    fd, tmp_path = tempfile.mkstemp(dir=parent, prefix=name + ".", suffix=".tmp")
+    os.close(fd)
 
     try:
-        writer(tmp_path)
+        writer(Path(tmp_path))
+        if batch is None:
+            _fsync_file(tmp_path)
+
+        os.replace(tmp_path, dst)
+        if batch is None:
+            _fsync_dir(parent)
+        else:
+            batch.add(dst, parent)
+    except BaseException:
+        # if writer failed, clean up temp
         try:
-            fd = os.open(str(tmp_path), os.O_RDONLY)
-            try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def atomic_write_with_fd(path: PathLike, writer_fd: Callable[[int, Path], None], *, durable: Durability = True) -> None:
+    """
+    Like atomic_write_with, but `writer_fd(fd, tmp_path)` writes through the
+    already-open temp fd, which is then fsynced directly instead of being
+    reopened. The writer must not close `fd`; for Pillow use e.g.
+    `img.save(os.fdopen(fd, "wb", closefd=False), format="PNG")`.
+    """
+    dst, parent, name = _split(path)
+    batch = _batch_for(durable)
+
+    fd, tmp_path = tempfile.mkstemp(dir=parent, prefix=name + ".", suffix=".tmp")
+    try:
+        try:
+            writer_fd(fd, Path(tmp_path))
+            if batch is None:
                 os.fsync(fd)
-            finally:
-                os.close(fd)
+        finally:
+            os.close(fd)
+
+        os.replace(tmp_path, dst)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
         except OSError:
             pass
+        raise
+
+    if batch is None:
+        _fsync_dir(parent)
+    else:
+        batch.add(dst, parent)
+
+
+def atomic_link_or_copy(src: PathLike, dst: PathLike, *, durable: Durability = True) -> None:
+    """
+    Atomically make `dst` a copy of the already-written file `src`: hardlink
+    when both are on one filesystem (no data is rewritten), otherwise copy.
+    Either way the new name lands with os.replace, so readers never see a
+    partial `dst`. `src` must not be modified in place afterwards.
+    """
+    src = os.fspath(src)
+    dst, parent, name = _split(dst)
+    batch = _batch_for(durable)
 
+    tmp_path = os.path.join(parent, f"{name}.{os.urandom(6).hex()}.tmp")
+    try:
+        try:
+            os.link(src, tmp_path)
+        except OSError:
+            # cross-device, or a filesystem without hardlinks
+            shutil.copyfile(src, tmp_path)
+            if batch is None:
+                _fsync_file(tmp_path)
         os.replace(tmp_path, dst)
-        _fsync_dir(dst.parent)
-    finally:
-        # if writer failed, clean up temp
-        if tmp_path.exists():
-            try:
-                tmp_path.unlink()
-            except OSError:
-                pass
\ No newline at end of file
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if batch is None:
+        _fsync_dir(parent)
+    else:
+        batch.add(dst, parent)
@@ -2,12 +2,17 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Literal, Optional, Tuple
+from typing import Any, Callable, Literal, Optional, Tuple
 
-from PIL import Image
+import numpy as np
+from PIL import Image, ImageChops
 
 from imkerutils.exquisite.api.client import TileGeneratorClient, GeneratorError
 from imkerutils.exquisite.api.mock_gpt_client import generate_tile
@@ -23,11 +28,24 @@ from imkerutils.exquisite.geometry.tile_mode import (
     split_tile,
     glue,
     expected_next_canvas_size,
+    _require_rgb,
     _tile_patch_for_overlap_glue,
 )
-from imkerutils.exquisite.io.atomic_write import atomic_write_text, atomic_write_with
+from imkerutils.exquisite.io.atomic_write import (
+    DeferredFsync,
+    atomic_link_or_copy,
+    atomic_write_text,
+    atomic_write_with,
+    atomic_write_with_fd,
+)
 from imkerutils.exquisite.state.session_state import SessionState
 
+_log = logging.getLogger(__name__)
+
+# Per-step debug/diff artifacts favour encode speed over size. Anything that
+# becomes (or is linked to) canvas_latest.png keeps Pillow's default level.
+_DEBUG_PNG = dict(format="PNG", compress_level=1, optimize=False)
+
 
 def _default_artifact_root() -> Path:
     pkg_root = Path(__file__).resolve().parents[2]
@@ -49,37 +67,94 @@ class DiskStepResult:
 # Blending utilities (optional)
 # -----------------------------
 
-def _overlap_crops_for_blend(
-    *,
-    canvas_rgb: Image.Image,
-    tile_rgb: Image.Image,
-    mode: ExtendMode,
-) -> tuple[Image.Image, Image.Image]:
-    canvas_rgb = canvas_rgb.convert("RGB")
-    tile_rgb = tile_rgb.convert("RGB")
-    cw, ch = canvas_rgb.size
+_Box = Tuple[int, int, int, int]
+_KEEP_PX = HALF_PX - OVERLAP_PX  # 0 under the full-tile contract
+
+# mode -> (canvas overlap box for canvas (w, h), tile overlap box,
+#          blend paste xy into the glued output for canvas (w, h))
+# The paste xy is the tile's glue origin plus the strip's offset within the tile.
+_BLEND_BOXES: dict[str, tuple[Callable[[int, int], _Box], _Box, Callable[[int, int], tuple[int, int]]]] = {
+    "x_ltr": (
+        lambda w, h: (w - OVERLAP_PX, 0, w, TILE_PX),
+        (HALF_PX - OVERLAP_PX, 0, HALF_PX, TILE_PX),                        # 256..512
+        lambda w, h: (w - OVERLAP_PX + HALF_PX - OVERLAP_PX, 0),
+    ),
+    "x_rtl": (
+        lambda w, h: (0, 0, OVERLAP_PX, TILE_PX),
+        (HALF_PX, 0, HALF_PX + OVERLAP_PX, TILE_PX),                        # 512..768
+        lambda w, h: (HALF_PX, 0),
+    ),
+    "y_ttb": (
+        lambda w, h: (0, h - OVERLAP_PX, TILE_PX, h),
+        (0, HALF_PX - OVERLAP_PX, TILE_PX, HALF_PX),                        # 256..512
+        lambda w, h: (0, h - OVERLAP_PX + HALF_PX - OVERLAP_PX),
+    ),
+    "y_btt": (
+        lambda w, h: (0, 0, TILE_PX, OVERLAP_PX),
+        (0, HALF_PX, TILE_PX, HALF_PX + OVERLAP_PX),                        # 512..768
+        lambda w, h: (0, HALF_PX),
+    ),
+}
+
+# mode -> (band box of the far KEEP region, tile paste xy)
+_KEEP_BOXES: dict[str, tuple[_Box, tuple[int, int]]] = {
+    "x_ltr": ((0, 0, _KEEP_PX, TILE_PX), (0, 0)),
+    "x_rtl": ((BAND_PX - _KEEP_PX, 0, BAND_PX, TILE_PX), (TILE_PX - _KEEP_PX, 0)),
+    "y_ttb": ((0, 0, TILE_PX, _KEEP_PX), (0, 0)),
+    "y_btt": ((0, BAND_PX - _KEEP_PX, TILE_PX, BAND_PX), (0, TILE_PX - _KEEP_PX)),
+}
+
+
+def _feather_values(feather_px: int) -> np.ndarray:
+    # round(255 * i / (n - 1)) for i in 0..n-1; np.rint rounds half-to-even like round()
+    return np.rint(255.0 * np.arange(feather_px) / max(1, feather_px - 1)).astype(np.uint8)
+
+
+def _img_eq(a: Image.Image, b: Image.Image) -> bool:
+    """
+    Pixel equality without serialising both images via tobytes(): one C
+    difference pass, then a bbox scan of the result.
+    """
+    return a.mode == b.mode and a.size == b.size and ImageChops.difference(a, b).getbbox(alpha_only=False) is None
 
-    if mode == "x_ltr":
-        c = canvas_rgb.crop((cw - OVERLAP_PX, 0, cw, TILE_PX))
-        t = tile_rgb.crop((HALF_PX - OVERLAP_PX, 0, HALF_PX, TILE_PX))        # 256..512
-        return c, t
 
-    if mode == "x_rtl":
-        c = canvas_rgb.crop((0, 0, OVERLAP_PX, TILE_PX))
-        t = tile_rgb.crop((HALF_PX, 0, HALF_PX + OVERLAP_PX, TILE_PX))        # 512..768
-        return c, t
+@lru_cache(maxsize=16)
+def _feather_mask(mode: ExtendMode, feather_px: int) -> Image.Image:
+    """
+    L mask over the overlap strip for _glue_with_feather. The strip size is fixed
+    by the geometry constants, so each (mode, feather_px) mask is built once and
+    shared; callers must not modify it.
+    """
+    if mode in ("x_ltr", "x_rtl"):
+        mask = np.zeros((TILE_PX, OVERLAP_PX), dtype=np.uint8)
+        # Same pixel order the old putdata() fill produced: each ramp value
+        # repeated ov_h times, laid out row-major into a (feather_px, ov_h) image.
+        ramp = np.repeat(_feather_values(feather_px), TILE_PX).reshape(TILE_PX, feather_px)
+        cols = slice(OVERLAP_PX - feather_px, None) if mode == "x_ltr" else slice(0, feather_px)
+        mask[:, cols] = ramp
+    elif mode in ("y_ttb", "y_btt"):
+        mask = np.zeros((OVERLAP_PX, TILE_PX), dtype=np.uint8)
+        ramp = np.repeat(_feather_values(feather_px), TILE_PX).reshape(feather_px, TILE_PX)
+        rows = slice(OVERLAP_PX - feather_px, None) if mode == "y_ttb" else slice(0, feather_px)
+        mask[rows] = ramp
+    else:
+        raise ValueError(mode)
 
-    if mode == "y_ttb":
-        c = canvas_rgb.crop((0, ch - OVERLAP_PX, TILE_PX, ch))
-        t = tile_rgb.crop((0, HALF_PX - OVERLAP_PX, TILE_PX, HALF_PX))        # 256..512
-        return c, t
+    return Image.fromarray(mask, mode="L")
 
-    if mode == "y_btt":
-        c = canvas_rgb.crop((0, 0, TILE_PX, OVERLAP_PX))
-        t = tile_rgb.crop((0, HALF_PX, TILE_PX, HALF_PX + OVERLAP_PX))        # 512..768
-        return c, t
 
-    raise ValueError(mode)
+@lru_cache(maxsize=16)
+def _feather_ramp(mode: ExtendMode, feather_px: int) -> Optional[tuple[Image.Image, tuple[int, int, int, int]]]:
+    """
+    The nonzero part of _feather_mask(mode, feather_px) and its box within the
+    overlap strip, or None if the mask is all zero. Outside this box a masked
+    paste leaves the destination untouched.
+    """
+    mask = _feather_mask(mode, feather_px)
+    box = mask.getbbox()
+    if box is None:
+        return None
+    return mask.crop(box), box
 
 
 def _glue_with_feather(
@@ -99,56 +174,36 @@ def _glue_with_feather(
     feather_px = int(feather_px)
     feather_px = max(1, min(feather_px, OVERLAP_PX))
 
-    canvas = canvas.convert("RGB")
-    tile = tile.convert("RGB")
-
-    canvas_ov, tile_ov = _overlap_crops_for_blend(canvas_rgb=canvas, tile_rgb=tile, mode=mode)
-    ov_w, ov_h = canvas_ov.size
-
-    if mode in ("x_ltr", "x_rtl"):
-        mask = Image.new("L", (ov_w, ov_h), 0)
-        ramp = Image.new("L", (feather_px, ov_h), 0)
-
-        ramp_pixels: list[int] = []
-        for x in range(feather_px):
-            a = int(round(255 * (x / max(1, feather_px - 1))))
-            ramp_pixels.extend([a] * ov_h)
-        ramp.putdata(ramp_pixels)
-
-        if mode == "x_ltr":
-            mask.paste(ramp, (ov_w - feather_px, 0))
-        else:
-            mask.paste(ramp, (0, 0))
-    else:
-        mask = Image.new("L", (ov_w, ov_h), 0)
-        ramp = Image.new("L", (ov_w, feather_px), 0)
-
-        ramp_pixels = []
-        for y in range(feather_px):
-            a = int(round(255 * (y / max(1, feather_px - 1))))
-            ramp_pixels.extend([a] * ov_w)
-        ramp.putdata(ramp_pixels)
-
-        if mode == "y_ttb":
-            mask.paste(ramp, (0, ov_h - feather_px))
-        else:
-            mask.paste(ramp, (0, 0))
-
-    blended_ov = Image.composite(tile_ov, canvas_ov, mask)
-
-    tile2 = tile.copy()
-    if mode == "x_ltr":
-        tile2.paste(blended_ov, (HALF_PX - OVERLAP_PX, 0))     # 256..512
-    elif mode == "x_rtl":
-        tile2.paste(blended_ov, (HALF_PX, 0))                  # 512..768
-    elif mode == "y_ttb":
-        tile2.paste(blended_ov, (0, HALF_PX - OVERLAP_PX))     # 256..512
-    elif mode == "y_btt":
-        tile2.paste(blended_ov, (0, HALF_PX))                  # 512..768
-    else:
-        raise ValueError(mode)
-
-    return glue(canvas, tile2, mode)
+    canvas = _require_rgb(canvas)
+    tile = _require_rgb(tile)
+    if tile.size != (TILE_PX, TILE_PX):
+        raise ValueError(f"Tile must be {TILE_PX}x{TILE_PX}, got {tile.size}")
+    try:
+        canvas_box, tile_box, blend_xy = _BLEND_BOXES[mode]
+    except KeyError:
+        raise ValueError(mode) from None
+
+    w, h = canvas.size
+    canvas_ov = canvas.crop(canvas_box(w, h))
+    assert _feather_mask(mode, feather_px).size == canvas_ov.size
+
+    # Hard-glue the raw tile, then overwrite just the overlap with the blend.
+    # Same pixels as blending into a tile copy and gluing that, but the only
+    # full-size image built is glue()'s output.
+    #
+    # Image.composite(tile_ov, canvas_ov, mask) is canvas_ov.copy() plus a masked
+    # paste of tile_ov. Do that in place: restore the canvas strip, then blend the
+    # tile back in only where the mask is nonzero, cropping just that box from
+    # the tile rather than its whole overlap strip.
+    xy = blend_xy(w, h)
+    out = glue(canvas, tile, mode)
+    out.paste(canvas_ov, xy)
+    ramp = _feather_ramp(mode, feather_px)
+    if ramp is not None:
+        ramp_mask, (x0, y0, x1, y1) = ramp
+        tx, ty = tile_box[:2]
+        out.paste(tile.crop((tx + x0, ty + y0, tx + x1, ty + y1)), (xy[0] + x0, xy[1] + y0), ramp_mask)
+    return out
 
 
 def _post_enforce_keep_into_tile(*, tile: Image.Image, band: Image.Image, mode: ExtendMode) -> Image.Image:
@@ -156,31 +211,140 @@ def _post_enforce_keep_into_tile(*, tile: Image.Image, band: Image.Image, mode:
     Session-side post-enforce to match OpenAITileGeneratorClient:
     paste ONLY the far KEEP region (256px), not the full band.
     """
-    keep_px = HALF_PX - OVERLAP_PX  # 256
-
-    if mode == "x_ltr":
-        src = band.crop((0, 0, keep_px, TILE_PX))
-        tile.paste(src, (0, 0))
-        return tile
-    if mode == "x_rtl":
-        src = band.crop((BAND_PX - keep_px, 0, BAND_PX, TILE_PX))
-        tile.paste(src, (TILE_PX - keep_px, 0))
-        return tile
-    if mode == "y_ttb":
-        src = band.crop((0, 0, TILE_PX, keep_px))
-        tile.paste(src, (0, 0))
-        return tile
-    if mode == "y_btt":
-        src = band.crop((0, BAND_PX - keep_px, TILE_PX, BAND_PX))
-        tile.paste(src, (0, TILE_PX - keep_px))
+    try:
+        band_box, xy = _KEEP_BOXES[mode]
+    except KeyError:
+        raise ValueError(mode) from None
+    if _KEEP_PX == 0:
+        # Full-tile contract: the KEEP region is empty, nothing to enforce.
         return tile
+    tile.paste(band.crop(band_box), xy)
+    return tile
+
+
+def _save_png(path: Path, img: Image.Image, opts: dict[str, Any], batch: DeferredFsync) -> None:
+    # Binds img now, so a queued write can't see a later rebinding of the caller's name.
+    # Step artifact: fsynced with the rest of the step by batch.flush().
+    atomic_write_with(path, lambda p: img.save(p, **opts), durable=batch)
+
+
+def _save_npy(path: Path, img: Image.Image, batch: DeferredFsync) -> None:
+    # Raw (h, w, 3) pixels: no compression CPU. Render to PNG offline with
+    # python -m imkerutils.exquisite.tools.render_npys.
+    arr = np.asarray(img)
+
+    def write(fd: int, _tmp: Path) -> None:
+        with os.fdopen(fd, "wb", closefd=False) as f:
+            np.save(f, arr)
 
-    raise ValueError(mode)
+    atomic_write_with_fd(path, write, durable=batch)
+
+
+def _save_artifact(step_dir: Path, stem: str, img: Image.Image, debug_artifacts: bool, batch: DeferredFsync) -> Path:
+    """
+    Write an ancillary step artifact as <stem>.png, or as raw <stem>.npy when
+    debug_artifacts is False. Returns the path written.
+    """
+    if debug_artifacts:
+        path = step_dir / f"{stem}.png"
+        _save_png(path, img, _DEBUG_PNG, batch)
+    else:
+        path = step_dir / f"{stem}.npy"
+        _save_npy(path, img, batch)
+    return path
+
+
+def _make_step_dir(step_dir: Path) -> None:
+    """
+    Create the leaf step directory with a single mkdir; steps/ already exists
+    from create(). An existing dir is a retry of a rejected step.
+    """
+    try:
+        os.mkdir(step_dir)
+    except FileExistsError:
+        pass
+    except FileNotFoundError:
+        # steps/ missing (hand-assembled or pruned session root)
+        os.makedirs(step_dir, exist_ok=True)
+
+
+def _wait_all(pending: list[Future]) -> None:
+    """Wait for every queued write, then re-raise the first failure."""
+    futures, pending[:] = list(pending), []
+    first_exc: Optional[BaseException] = None
+    for f in futures:
+        exc = f.exception()
+        if exc is not None and first_exc is None:
+            first_exc = exc
+    if first_exc is not None:
+        raise first_exc
+
+
+def _drain_logged(pending: list[Future], step_dir: Path) -> None:
+    """
+    Wait for every queued write of a step that is already returning or raising.
+    Failures are logged, not raised: they must not replace a rejected
+    DiskStepResult or mask the exception in flight.
+    """
+    futures, pending[:] = list(pending), []
+    for f in futures:
+        exc = f.exception()
+        if exc is not None:
+            _log.warning("Artifact write failed in %s: %s: %s", step_dir, type(exc).__name__, exc)
 
 
 class ExquisiteSession:
     def __init__(self, state: SessionState):
         self.state = state
+        # Last committed canvas, kept so the next step doesn't re-decode the PNG
+        # it just wrote. Only trusted while canvas_latest.png is still the file
+        # it was committed as (see _canvas_file_id); None until the first step
+        # after open().
+        self._canvas: Optional[Image.Image] = None
+        self._canvas_id: Optional[tuple[int, int]] = None
+        # Artifact writes are independent of each other; PNG encode releases the GIL.
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="exquisite-io")
+
+    def close(self) -> None:
+        """Finish queued artifact writes and stop the I/O pool's threads."""
+        self._io_pool.shutdown(wait=True)
+
+    def __enter__(self) -> "ExquisiteSession":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _canvas_file_id(self) -> tuple[int, int]:
+        st = os.stat(self.state.canvas_path)
+        return st.st_ino, st.st_mtime_ns
+
+    def _remember_canvas(self, canvas: Image.Image) -> None:
+        self._canvas = canvas
+        self._canvas_id = self._canvas_file_id()
+
+    def _cached_canvas(self) -> Optional[Image.Image]:
+        # canvas_latest.png replaced or rewritten since we kept it: stale.
+        if self._canvas is not None and self._canvas_id != self._canvas_file_id():
+            self._canvas = None
+        return self._canvas
+
+    def _current_canvas(self) -> Image.Image:
+        canvas = self._cached_canvas()
+        if canvas is None:
+            file_id = self._canvas_file_id()
+            canvas = Image.open(self.state.canvas_path).convert("RGB")
+            self._canvas, self._canvas_id = canvas, file_id
+        return canvas
+
+    def _current_canvas_size(self) -> tuple[int, int]:
+        # Header-only peek when the canvas isn't in memory; steps rejected on
+        # size never decode the PNG.
+        canvas = self._cached_canvas()
+        if canvas is not None:
+            return canvas.size
+        with Image.open(self.state.canvas_path) as im:
+            return im.size
 
     @classmethod
     def create(
@@ -217,12 +381,15 @@ class ExquisiteSession:
         atomic_write_with(state.canvas_path, lambda p: img.save(p, format="PNG"))
 
         step0 = state.step_dir(0)
-        step0.mkdir(parents=True, exist_ok=True)
-        atomic_write_with(step0 / "canvas_initial.png", lambda p: img.save(p, format="PNG"))
+        _make_step_dir(step0)
+        # Same pixels as canvas_latest.png; share its encoded bytes.
+        atomic_link_or_copy(state.canvas_path, step0 / "canvas_initial.png")
         atomic_write_text(step0 / "committed.ok", "ok\n")
 
         atomic_write_text(state.state_path, json.dumps(state.to_dict(), indent=2, sort_keys=True) + "\n")
-        return cls(state)
+        sess = cls(state)
+        sess._remember_canvas(img)
+        return sess
 
     @classmethod
     def open(cls, *, session_root: Path) -> "ExquisiteSession":
@@ -244,16 +411,16 @@ class ExquisiteSession:
         enforce_band_identity: bool = True,
         num_candidates: int = 1,  # kept for caller compatibility; ignored (single-sample only)
         feather_px: int = 0,
+        debug_artifacts: bool = True,                 # False: ancillary tile/band artifacts as raw .npy
     ) -> DiskStepResult:
         _ = num_candidates  # intentionally unused (single-sample pipeline)
 
-        canvas = Image.open(self.state.canvas_path).convert("RGB")
-        w0, h0 = canvas.size
+        w0, h0 = self._current_canvas_size()
 
         mode = self.state.mode
         step_index_next = self.state.step_index_current + 1
         step_dir = self.state.step_dir(step_index_next)
-        step_dir.mkdir(parents=True, exist_ok=True)
+        _make_step_dir(step_dir)
 
         if mode in ("x_ltr", "x_rtl") and h0 != TILE_PX:
             return DiskStepResult(
@@ -276,18 +443,19 @@ class ExquisiteSession:
                 rejection_reason="CanvasWidthNot1024",
             )
 
+        canvas = self._current_canvas()
         band = extract_conditioning_band(canvas, mode)
 
         # Single tile only (no multi-candidate scoring).
-        tile = generate_tile(
+        tile = _require_rgb(generate_tile(
             conditioning_band=band,
             mode=mode,
             prompt=prompt,
             step_index=(step_index_next * 1000),
-        ).convert("RGB")
+        ))
 
-        cond_half, _new_half = split_tile(tile, mode)
-        if enforce_band_identity and (cond_half.tobytes() != band.tobytes()):
+        cond_half, new_half = split_tile(tile, mode)
+        if enforce_band_identity and not _img_eq(cond_half, band):
             return DiskStepResult(
                 "rejected",
                 self.state.session_id,
@@ -313,27 +481,49 @@ class ExquisiteSession:
                 rejection_reason=f"CanvasDimInvariantViolation: got {(w1, h1)} expected {(exp_w, exp_h)}",
             )
 
-        atomic_write_text(step_dir / "prompt.txt", prompt + "\n")
-        atomic_write_with(step_dir / "conditioning_band.png", lambda p: band.save(p, format="PNG"))
-        atomic_write_with(step_dir / "canvas_before.png", lambda p: canvas.save(p, format="PNG"))
-        atomic_write_with(step_dir / "canvas_after.png", lambda p: canvas_next.save(p, format="PNG"))
-
-        patch = _tile_patch_for_overlap_glue(tile, mode)
-        atomic_write_with(step_dir / "tile_patch.png", lambda p: patch.save(p, format="PNG"))
-        atomic_write_with(step_dir / "tile_full.png", lambda p: tile.save(p, format="PNG"))
-
-        _cond_half, new_half = split_tile(tile, mode)
-        atomic_write_with(step_dir / "new_half.png", lambda p: new_half.save(p, format="PNG"))
-
-        atomic_write_with(self.state.canvas_path, lambda p: canvas_next.save(p, format="PNG"))
-
-        self.state.canvas_width_px_expected = w1
-        self.state.canvas_height_px_expected = h1
-        self.state.step_index_current = step_index_next
-        atomic_write_text(self.state.state_path, json.dumps(self.state.to_dict(), indent=2, sort_keys=True) + "\n")
-        atomic_write_text(step_dir / "committed.ok", "ok\n")
-
-        return DiskStepResult("committed", self.state.session_id, step_index_next, (w0, h0), (w1, h1), str(step_dir))
+        # This step's deferred fsyncs; flushed before the durable commit markers.
+        batch = DeferredFsync()
+        pending: list[Future] = []
+        try:
+            # Independent artifact encodes run on the I/O pool; all are drained
+            # (and the first failure raised) before anything links to them.
+            submit = self._io_pool.submit
+            pending += [
+                submit(atomic_write_text, step_dir / "prompt.txt", prompt + "\n", durable=batch),
+                submit(_save_artifact, step_dir, "conditioning_band", band, debug_artifacts, batch),
+                submit(_save_png, step_dir / "canvas_after.png", canvas_next, {"format": "PNG"}, batch),
+                submit(_save_artifact, step_dir, "new_half", new_half, debug_artifacts, batch),
+            ]
+            tile_full_f = submit(_save_artifact, step_dir, "tile_full", tile, debug_artifacts, batch)
+            pending.append(tile_full_f)
+            patch = _tile_patch_for_overlap_glue(tile, mode)
+            if patch is not tile:
+                pending.append(submit(_save_artifact, step_dir, "tile_patch", patch, debug_artifacts, batch))
+            # The canvas we started from is canvas_latest.png as committed last step.
+            atomic_link_or_copy(self.state.canvas_path, step_dir / "canvas_before.png", durable=batch)
+            _wait_all(pending)
+
+            if patch is tile:
+                # Full-tile contract: the patch is the tile itself, so share its file.
+                tile_full = tile_full_f.result()
+                atomic_link_or_copy(tile_full, tile_full.with_name("tile_patch" + tile_full.suffix), durable=batch)
+
+            # Same bytes as canvas_after.png: link it rather than encode the canvas twice.
+            atomic_link_or_copy(step_dir / "canvas_after.png", self.state.canvas_path, durable=batch)
+            # One batched fsync pass for everything above, before the durable commit markers.
+            batch.flush()
+
+            self.state.canvas_width_px_expected = w1
+            self.state.canvas_height_px_expected = h1
+            self.state.step_index_current = step_index_next
+            atomic_write_text(self.state.state_path, json.dumps(self.state.to_dict(), indent=2, sort_keys=True) + "\n")
+            atomic_write_text(step_dir / "committed.ok", "ok\n")
+            self._remember_canvas(canvas_next)
+
+            return DiskStepResult("committed", self.state.session_id, step_index_next, (w0, h0), (w1, h1), str(step_dir))
+        except BaseException:
+            _drain_logged(pending, step_dir)
+            raise
 
     def execute_step_real(
         self,
@@ -343,126 +533,149 @@ class ExquisiteSession:
         enforce_band_identity: bool = False,          # default OFF for now
         post_enforce_band_identity: bool = True,      # keep your KEEP-only paste if you want
         feather_px: int = 128,
+        debug_artifacts: bool = True,                 # False: ancillary tile/band artifacts as raw .npy
     ) -> DiskStepResult:
-        canvas = Image.open(self.state.canvas_path).convert("RGB")
-        w0, h0 = canvas.size
-
         mode = self.state.mode
         step_index_next = self.state.step_index_current + 1
         step_dir = self.state.step_dir(step_index_next)
-        step_dir.mkdir(parents=True, exist_ok=True)
-
-        if mode in ("x_ltr", "x_rtl") and h0 != TILE_PX:
-            return DiskStepResult(
-                "rejected",
-                self.state.session_id,
-                step_index_next,
-                (w0, h0),
-                (w0, h0),
-                str(step_dir),
-                rejection_reason="CanvasHeightNot1024",
-            )
-        if mode in ("y_ttb", "y_btt") and w0 != TILE_PX:
-            return DiskStepResult(
-                "rejected",
-                self.state.session_id,
-                step_index_next,
-                (w0, h0),
-                (w0, h0),
-                str(step_dir),
-                rejection_reason="CanvasWidthNot1024",
-            )
-
-        band = extract_conditioning_band(canvas, mode)
-
-        # Persist inputs up-front so you can diff even if generation crashes.
-        atomic_write_text(step_dir / "prompt.txt", prompt + "\n")
-        atomic_write_with(step_dir / "conditioning_band.png", lambda p: band.save(p, format="PNG"))
-        atomic_write_with(step_dir / "canvas_before.png", lambda p: canvas.save(p, format="PNG"))
 
+        # Queued artifact writes; always drained (and fsynced via this step's own
+        # batch) before returning, so inputs persisted for a rejected step are on
+        # disk when the caller sees it.
+        batch = DeferredFsync()
+        pending: list[Future] = []
         try:
-            tile = client.generate_tile(
-                conditioning_band=band,
-                mode=mode,
-                prompt=prompt,
-                step_index=step_index_next,
-            ).convert("RGB")
-        except GeneratorError as e:
-            msg = f"GeneratorError: {e}"
-            atomic_write_text(step_dir / "rejected.err", msg + "\n")
-            return DiskStepResult(
-                "rejected",
-                self.state.session_id,
-                step_index_next,
-                (w0, h0),
-                (w0, h0),
-                str(step_dir),
-                rejection_reason=msg,
-            )
-        except Exception as e:
-            msg = f"Exception: {type(e).__name__}: {e}"
-            atomic_write_text(step_dir / "rejected.err", msg + "\n")
-            return DiskStepResult(
-                "rejected",
-                self.state.session_id,
-                step_index_next,
-                (w0, h0),
-                (w0, h0),
-                str(step_dir),
-                rejection_reason=msg,
-            )
-
-        if tile.size != (TILE_PX, TILE_PX):
-            msg = f"BadTileSize: {tile.size}"
-            atomic_write_text(step_dir / "rejected.err", msg + "\n")
-            return DiskStepResult(
-                "rejected",
-                self.state.session_id,
-                step_index_next,
-                (w0, h0),
-                (w0, h0),
-                str(step_dir),
-                rejection_reason=msg,
-            )
-
-        if post_enforce_band_identity:
-            tile = _post_enforce_keep_into_tile(tile=tile, band=band, mode=mode)
-
-        # Optional identity check, but DO NOT block committing right now.
-        if enforce_band_identity:
-            cond_half, _ = split_tile(tile, mode)
-            if cond_half.size == band.size and cond_half.tobytes() != band.tobytes():
-                atomic_write_text(step_dir / "warn.txt", "BandIdentityMismatch\n")
-
-        # Save outputs
-        atomic_write_with(step_dir / "tile_full.png", lambda p: tile.save(p, format="PNG"))
-        _cond_half, new_half = split_tile(tile, mode)
-        atomic_write_with(step_dir / "new_half.png", lambda p: new_half.save(p, format="PNG"))
-
-        canvas_next = _glue_with_feather(canvas=canvas, tile=tile, mode=mode, feather_px=feather_px)
-        w1, h1 = canvas_next.size
-
-        exp_w, exp_h = expected_next_canvas_size(canvas, mode)
-        if (w1, h1) != (exp_w, exp_h):
-            msg = f"CanvasDimInvariantViolation: got {(w1, h1)} expected {(exp_w, exp_h)}"
-            atomic_write_text(step_dir / "rejected.err", msg + "\n")
-            return DiskStepResult(
-                "rejected",
-                self.state.session_id,
-                step_index_next,
-                (w0, h0),
-                (w0, h0),
-                str(step_dir),
-                rejection_reason=msg,
-            )
-
-        atomic_write_with(step_dir / "canvas_after.png", lambda p: canvas_next.save(p, format="PNG"))
-        atomic_write_with(self.state.canvas_path, lambda p: canvas_next.save(p, format="PNG"))
-
-        self.state.canvas_width_px_expected = w1
-        self.state.canvas_height_px_expected = h1
-        self.state.step_index_current = step_index_next
-        atomic_write_text(self.state.state_path, json.dumps(self.state.to_dict(), indent=2, sort_keys=True) + "\n")
-        atomic_write_text(step_dir / "committed.ok", "ok\n")
-
-        return DiskStepResult("committed", self.state.session_id, step_index_next, (w0, h0), (w1, h1), str(step_dir))
\ No newline at end of file
+            w0, h0 = self._current_canvas_size()
+            _make_step_dir(step_dir)
+
+            if mode in ("x_ltr", "x_rtl") and h0 != TILE_PX:
+                return DiskStepResult(
+                    "rejected",
+                    self.state.session_id,
+                    step_index_next,
+                    (w0, h0),
+                    (w0, h0),
+                    str(step_dir),
+                    rejection_reason="CanvasHeightNot1024",
+                )
+            if mode in ("y_ttb", "y_btt") and w0 != TILE_PX:
+                return DiskStepResult(
+                    "rejected",
+                    self.state.session_id,
+                    step_index_next,
+                    (w0, h0),
+                    (w0, h0),
+                    str(step_dir),
+                    rejection_reason="CanvasWidthNot1024",
+                )
+
+            canvas = self._current_canvas()
+            band = extract_conditioning_band(canvas, mode)
+
+            # Persist inputs up-front so you can diff even if generation crashes.
+            submit = self._io_pool.submit
+            pending.append(submit(atomic_write_text, step_dir / "prompt.txt", prompt + "\n", durable=batch))
+            pending.append(submit(_save_artifact, step_dir, "conditioning_band", band, debug_artifacts, batch))
+            # The canvas we started from is canvas_latest.png as committed last step.
+            atomic_link_or_copy(self.state.canvas_path, step_dir / "canvas_before.png", durable=batch)
+
+            try:
+                tile = _require_rgb(client.generate_tile(
+                    conditioning_band=band,
+                    mode=mode,
+                    prompt=prompt,
+                    step_index=step_index_next,
+                ))
+            except GeneratorError as e:
+                msg = f"GeneratorError: {e}"
+                atomic_write_text(step_dir / "rejected.err", msg + "\n")
+                return DiskStepResult(
+                    "rejected",
+                    self.state.session_id,
+                    step_index_next,
+                    (w0, h0),
+                    (w0, h0),
+                    str(step_dir),
+                    rejection_reason=msg,
+                )
+            except Exception as e:
+                msg = f"Exception: {type(e).__name__}: {e}"
+                atomic_write_text(step_dir / "rejected.err", msg + "\n")
+                return DiskStepResult(
+                    "rejected",
+                    self.state.session_id,
+                    step_index_next,
+                    (w0, h0),
+                    (w0, h0),
+                    str(step_dir),
+                    rejection_reason=msg,
+                )
+
+            if tile.size != (TILE_PX, TILE_PX):
+                msg = f"BadTileSize: {tile.size}"
+                atomic_write_text(step_dir / "rejected.err", msg + "\n")
+                return DiskStepResult(
+                    "rejected",
+                    self.state.session_id,
+                    step_index_next,
+                    (w0, h0),
+                    (w0, h0),
+                    str(step_dir),
+                    rejection_reason=msg,
+                )
+
+            if post_enforce_band_identity:
+                tile = _post_enforce_keep_into_tile(tile=tile, band=band, mode=mode)
+
+            cond_half, new_half = split_tile(tile, mode)
+
+            # Optional identity check, but DO NOT block committing right now.
+            if enforce_band_identity:
+                if cond_half.size == band.size and not _img_eq(cond_half, band):
+                    atomic_write_text(step_dir / "warn.txt", "BandIdentityMismatch\n", durable=batch)
+
+            # Save outputs
+            pending.append(submit(_save_artifact, step_dir, "tile_full", tile, debug_artifacts, batch))
+            pending.append(submit(_save_artifact, step_dir, "new_half", new_half, debug_artifacts, batch))
+
+            canvas_next = _glue_with_feather(canvas=canvas, tile=tile, mode=mode, feather_px=feather_px)
+            w1, h1 = canvas_next.size
+
+            exp_w, exp_h = expected_next_canvas_size(canvas, mode)
+            if (w1, h1) != (exp_w, exp_h):
+                msg = f"CanvasDimInvariantViolation: got {(w1, h1)} expected {(exp_w, exp_h)}"
+                atomic_write_text(step_dir / "rejected.err", msg + "\n")
+                return DiskStepResult(
+                    "rejected",
+                    self.state.session_id,
+                    step_index_next,
+                    (w0, h0),
+                    (w0, h0),
+                    str(step_dir),
+                    rejection_reason=msg,
+                )
+
+            pending.append(submit(_save_png, step_dir / "canvas_after.png", canvas_next, {"format": "PNG"}, batch))
+            _wait_all(pending)
+            # Same bytes as canvas_after.png: link it rather than encode the canvas twice.
+            atomic_link_or_copy(step_dir / "canvas_after.png", self.state.canvas_path, durable=batch)
+            # One batched fsync pass for everything above, before the durable commit markers.
+            batch.flush()
+
+            self.state.canvas_width_px_expected = w1
+            self.state.canvas_height_px_expected = h1
+            self.state.step_index_current = step_index_next
+            atomic_write_text(self.state.state_path, json.dumps(self.state.to_dict(), indent=2, sort_keys=True) + "\n")
+            atomic_write_text(step_dir / "committed.ok", "ok\n")
+            self._remember_canvas(canvas_next)
+
+            return DiskStepResult("committed", self.state.session_id, step_index_next, (w0, h0), (w1, h1), str(step_dir))
+        finally:
+            # A committed step drained (and raised on) its writes above; anything
+            # still queued belongs to a rejected or failing step, whose own
+            # outcome takes precedence over a failed artifact write.
+            _drain_logged(pending, step_dir)
+            try:
+                batch.flush()  # rejected steps: make the persisted inputs durable too
+            except OSError as e:
+                _log.warning("fsync of step artifacts failed in %s: %s", step_dir, e)
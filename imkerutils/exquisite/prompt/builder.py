@@ -2,11 +2,14 @@
 from __future__ import annotations
 
 import hashlib
+import logging
 from dataclasses import dataclass
 
 from imkerutils.exquisite.geometry.tile_mode import ExtendMode
 from imkerutils.exquisite.prompt.templates import render_prompt
 
+_log = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class PromptPayload:
@@ -41,8 +44,8 @@ def build_prompt_payload(
         negative=negative,
     )
 
-    print("API FACING PROMPT:")
-    print(full, "\n---END PROMPT---\n")
+    if _log.isEnabledFor(logging.DEBUG):
+        _log.debug("API FACING PROMPT:\n%s\n---END PROMPT---", full)
 
     h = hashlib.sha256(full.encode("utf-8")).hexdigest()
     return PromptPayload(full_prompt=full, sha256_hex=h)
\ No newline at end of file
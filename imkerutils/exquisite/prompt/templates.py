@@ -1,6 +1,7 @@
 # imkerutils/exquisite/prompt/templates.py
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 
 from imkerutils.exquisite.geometry.tile_mode import ExtendMode
@@ -45,6 +46,7 @@ def placement_convention_for_mode(mode: ExtendMode) -> PlacementConvention:
     raise ValueError(f"Unknown mode: {mode}")
 
 
+@functools.lru_cache(maxsize=64)
 def render_prompt(
     *,
     mode: ExtendMode,
@@ -0,0 +1,42 @@
+# imkerutils/exquisite/tools/render_npys.py
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from imkerutils.exquisite.io.atomic_write import atomic_write_with
+
+
+def render_npys(root: Path, *, force: bool = False) -> list[Path]:
+    """
+    Render every raw step artifact (*.npy, written with debug_artifacts=False)
+    under `root` to a sibling PNG. Existing PNGs are kept unless force=True.
+    Returns the PNGs written.
+    """
+    written: list[Path] = []
+    for npy in sorted(root.rglob("*.npy")):
+        png = npy.with_suffix(".png")
+        if png.exists() and not force:
+            continue
+        img = Image.fromarray(np.load(npy), mode="RGB")
+        atomic_write_with(png, lambda p: img.save(p, format="PNG"))
+        written.append(png)
+    return written
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(prog="python -m imkerutils.exquisite.tools.render_npys")
+    p.add_argument("roots", nargs="+", type=str, help="Session roots or step dirs to scan for *.npy artifacts.")
+    p.add_argument("--force", action="store_true", help="Re-render even if the PNG already exists.")
+    args = p.parse_args()
+
+    for root in args.roots:
+        for png in render_npys(Path(root).expanduser(), force=args.force):
+            print(f"Rendered: {png}")
+
+
+if __name__ == "__main__":
+    main()
@@ -791,4 +791,7 @@ def run_server(*, initial_canvas: Path, mode: ExtendMode = "x_ltr", host: str =
 
     server = ReuseHTTPServer((host, port), ExquisiteHandler)
     print(f"Running at http://{host}:{port}")
-    server.serve_forever()
\ No newline at end of file
+    try:
+        server.serve_forever()
+    finally:
+        session.close()
\ No newline at end of file
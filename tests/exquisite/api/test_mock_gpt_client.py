@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from imkerutils.exquisite.api import mock_gpt_client
+from imkerutils.exquisite.api.mock_gpt_client import generate_tile
+from imkerutils.exquisite.geometry.tile_mode import BAND_PX, TILE_PX, split_tile
+
+MODES = ["x_ltr", "x_rtl", "y_ttb", "y_btt"]
+
+
+def _band(mode: str) -> Image.Image:
+    size = (BAND_PX, TILE_PX) if mode in ("x_ltr", "x_rtl") else (TILE_PX, BAND_PX)
+    rng = np.random.default_rng(3)
+    return Image.fromarray(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8), "RGB")
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_mock_tile_is_deterministic_and_keeps_band(mode: str) -> None:
+    band = _band(mode)
+    a = generate_tile(conditioning_band=band, mode=mode, prompt="p", step_index=1)  # type: ignore[arg-type]
+    b = generate_tile(conditioning_band=band, mode=mode, prompt="p", step_index=1)  # type: ignore[arg-type]
+    c = generate_tile(conditioning_band=band, mode=mode, prompt="q", step_index=1)  # type: ignore[arg-type]
+
+    assert a.tobytes() == b.tobytes()
+    assert split_tile(a, mode)[0].tobytes() == band.tobytes()  # type: ignore[arg-type]
+    assert split_tile(a, mode)[1].tobytes() != split_tile(c, mode)[1].tobytes()  # type: ignore[arg-type]
+    # New half is gray: R == G == B.
+    new = np.asarray(split_tile(a, mode)[1])  # type: ignore[arg-type]
+    assert (new == new[..., :1]).all()
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_mock_cache_holds_only_the_new_half(mode: str) -> None:
+    data = mock_gpt_client._deterministic_new_half_bytes(mode, b"seed")  # type: ignore[arg-type]
+    assert len(data) == TILE_PX * (TILE_PX - BAND_PX)
+
+
+@pytest.mark.parametrize("value, checked", [("1", True), ("0", False), ("", False)])
+def test_mock_sanity_check_is_opt_in_with_1(value: str, checked: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+
+    def spy(tile: Image.Image, mode: str):
+        calls.append(mode)
+        return split_tile(tile, mode)  # type: ignore[arg-type]
+
+    monkeypatch.setenv("IMKER_MOCK_SANITY", value)
+    monkeypatch.setattr(mock_gpt_client, "split_tile", spy)
+    generate_tile(conditioning_band=_band("x_ltr"), mode="x_ltr", prompt="p", step_index=1)
+    assert bool(calls) is (checked and __debug__)
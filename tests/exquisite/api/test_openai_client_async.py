@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import io
+from types import SimpleNamespace
+
+from PIL import Image
+
+from imkerutils.exquisite.api.openai_client import OpenAITileGeneratorClient
+from imkerutils.exquisite.geometry.tile_mode import TILE_PX, BAND_PX
+
+MODES = ["x_ltr", "x_rtl", "y_ttb", "y_btt"]
+
+
+def _b64_png(img: Image.Image) -> str:
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+class _FakeAsyncImages:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+        self._payload = _b64_png(Image.new("RGB", (TILE_PX, TILE_PX), (9, 9, 9)))
+
+    async def edit(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(0)
+        return SimpleNamespace(data=[SimpleNamespace(b64_json=self._payload)])
+
+
+def test_generate_tile_async_gathers_all_modes() -> None:
+    client = OpenAITileGeneratorClient(api_key="sk-test-not-used")
+    images = _FakeAsyncImages()
+    client._async_client = SimpleNamespace(images=images)  # type: ignore[assignment]
+
+    def band_for(mode: str) -> Image.Image:
+        size = (BAND_PX, TILE_PX) if mode in ("x_ltr", "x_rtl") else (TILE_PX, BAND_PX)
+        return Image.new("RGB", size)
+
+    async def run() -> list[Image.Image]:
+        return await asyncio.gather(
+            *(
+                client.generate_tile_async(conditioning_band=band_for(m), mode=m, prompt="p", step_index=i)  # type: ignore[arg-type]
+                for i, m in enumerate(MODES)
+            )
+        )
+
+    tiles = asyncio.run(run())
+
+    assert [t.size for t in tiles] == [(TILE_PX, TILE_PX)] * len(MODES)
+    assert len(images.calls) == len(MODES)
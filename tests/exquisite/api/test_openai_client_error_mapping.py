@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import openai
+import pytest
+from PIL import Image
+
+try:
+    import httpx
+except ImportError:  # newer openai releases ship the client as httpx2
+    import httpx2 as httpx  # type: ignore[no-redef]
+
+from imkerutils.exquisite.api.client import (
+    GeneratorBillingLimitError,
+    GeneratorSafetyRefusal,
+    GeneratorTransientError,
+)
+from imkerutils.exquisite.api.openai_client import OpenAITileGeneratorClient
+
+
+def _client_raising(exc: Exception) -> OpenAITileGeneratorClient:
+    client = OpenAITileGeneratorClient(api_key="sk-test-not-used")
+
+    def _edit(**_kwargs):
+        raise exc
+
+    client._client = SimpleNamespace(images=SimpleNamespace(edit=_edit))  # type: ignore[assignment]
+    return client
+
+
+_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/images/edits")
+
+
+def _status_error(cls: type, status: int, code: str | None, message: str = "Error") -> Exception:
+    body = None if code is None else {"code": code, "message": message}
+    return cls(message, response=httpx.Response(status, request=_REQUEST), body=body)
+
+
+def _generate(client: OpenAITileGeneratorClient) -> None:
+    client.generate_tile(
+        conditioning_band=Image.new("RGB", (512, 1024)),
+        mode="x_ltr",
+        prompt="p",
+        step_index=0,
+    )
+
+
+@pytest.mark.parametrize(
+    "exc, expected",
+    [
+        (openai.APITimeoutError(request=_REQUEST), GeneratorTransientError),
+        (_status_error(openai.RateLimitError, 429, None), GeneratorTransientError),
+        (_status_error(openai.BadRequestError, 400, "billing_hard_limit_reached"), GeneratorBillingLimitError),
+        (_status_error(openai.BadRequestError, 400, "moderation_blocked"), GeneratorSafetyRefusal),
+    ],
+)
+def test_openai_sdk_errors_classify_on_type_and_code(exc: Exception, expected: type) -> None:
+    with pytest.raises(expected) as info:
+        _generate(_client_raising(exc))
+    assert info.value.__cause__ is exc
+
+
+def test_openai_status_error_is_not_classified_by_message() -> None:
+    exc = _status_error(openai.BadRequestError, 400, "invalid_value", "mask mentions moderation and timeout")
+    with pytest.raises(openai.BadRequestError):
+        _generate(_client_raising(exc))
+
+
+@pytest.mark.parametrize(
+    "msg, expected",
+    [
+        ("Error code: 400 - billing_hard_limit_reached", GeneratorBillingLimitError),
+        ("Request timed out.", GeneratorTransientError),
+        ("Rate limit reached for gpt-image", GeneratorTransientError),
+        ("Your request was rejected by the safety system", GeneratorSafetyRefusal),
+    ],
+)
+def test_non_sdk_errors_map_by_message(msg: str, expected: type) -> None:
+    client = _client_raising(RuntimeError(msg))
+    with pytest.raises(expected):
+        client.generate_tile(
+            conditioning_band=Image.new("RGB", (512, 1024)),
+            mode="x_ltr",
+            prompt="p",
+            step_index=0,
+        )
+
+
+def test_unclassified_sdk_error_propagates_unchanged() -> None:
+    client = _client_raising(KeyError("something else"))
+    with pytest.raises(KeyError):
+        client.generate_tile(
+            conditioning_band=Image.new("RGB", (512, 1024)),
+            mode="x_ltr",
+            prompt="p",
+            step_index=0,
+        )
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from imkerutils.exquisite.geometry.overlap_score import (
+    extract_scoring_strips,
+    score_tile_sobel_corr,
+)
+from imkerutils.exquisite.geometry.tile_mode import TILE_PX, HALF_PX, OVERLAP_PX
+
+MODES = ["x_ltr", "x_rtl", "y_ttb", "y_btt"]
+
+
+def _noise(size: tuple[int, int], seed: int) -> Image.Image:
+    w, h = size
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 256, (h, w, 3), dtype=np.uint8), "RGB")
+
+
+def _canvas_for(mode: str) -> Image.Image:
+    if mode in ("x_ltr", "x_rtl"):
+        return _noise((TILE_PX + HALF_PX, TILE_PX), seed=1)
+    return _noise((TILE_PX, TILE_PX + HALF_PX), seed=1)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_extract_scoring_strips_matches_pil_crop(mode: str) -> None:
+    canvas = _canvas_for(mode)
+    tile = _noise((TILE_PX, TILE_PX), seed=2)
+    w, h = canvas.size
+
+    boxes = {
+        "x_ltr": ((w - OVERLAP_PX, 0, w, TILE_PX), (HALF_PX, 0, HALF_PX + OVERLAP_PX, TILE_PX)),
+        "x_rtl": ((0, 0, OVERLAP_PX, TILE_PX), (HALF_PX - OVERLAP_PX, 0, HALF_PX, TILE_PX)),
+        "y_ttb": ((0, h - OVERLAP_PX, TILE_PX, h), (0, HALF_PX, TILE_PX, HALF_PX + OVERLAP_PX)),
+        "y_btt": ((0, 0, TILE_PX, OVERLAP_PX), (0, HALF_PX - OVERLAP_PX, TILE_PX, HALF_PX)),
+    }
+    c_box, t_box = boxes[mode]
+
+    c_strip, t_strip = extract_scoring_strips(canvas, tile, mode)  # type: ignore[arg-type]
+    assert c_strip.tobytes() == canvas.crop(c_box).tobytes()
+    assert t_strip.tobytes() == tile.crop(t_box).tobytes()
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_score_is_one_when_strips_match(mode: str) -> None:
+    canvas = _canvas_for(mode)
+    tile = _noise((TILE_PX, TILE_PX), seed=3)
+
+    # Make the tile's scored strip a copy of the canvas strip.
+    c_strip, _ = extract_scoring_strips(canvas, tile, mode)  # type: ignore[arg-type]
+    offset = {
+        "x_ltr": (HALF_PX, 0),
+        "x_rtl": (HALF_PX - OVERLAP_PX, 0),
+        "y_ttb": (0, HALF_PX),
+        "y_btt": (0, HALF_PX - OVERLAP_PX),
+    }[mode]
+    tile.paste(c_strip, offset)
+
+    assert score_tile_sobel_corr(canvas, tile, mode) == pytest.approx(1.0, abs=1e-5)  # type: ignore[arg-type]
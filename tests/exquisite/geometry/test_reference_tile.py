@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from imkerutils.exquisite.geometry.reference_tile import (
+    build_reference_tile_and_mask,
+    encode_mask_png_bytes,
+    encode_png_bytes,
+)
+from imkerutils.exquisite.geometry.tile_mode import TILE_PX, BAND_PX
+
+MODES = ["x_ltr", "x_rtl", "y_ttb", "y_btt"]
+
+# (band paste offset, band region as (y slice, x slice)) per mode
+_BAND_REGION = {
+    "x_ltr": ((0, 0), (slice(None), slice(0, BAND_PX))),
+    "x_rtl": ((TILE_PX - BAND_PX, 0), (slice(None), slice(TILE_PX - BAND_PX, None))),
+    "y_ttb": ((0, 0), (slice(0, BAND_PX), slice(None))),
+    "y_btt": ((0, TILE_PX - BAND_PX), (slice(TILE_PX - BAND_PX, None), slice(None))),
+}
+
+
+def _band_for(mode: str) -> Image.Image:
+    w, h = (BAND_PX, TILE_PX) if mode in ("x_ltr", "x_rtl") else (TILE_PX, BAND_PX)
+    rng = np.random.default_rng(0)
+    return Image.fromarray(rng.integers(0, 256, (h, w, 3), dtype=np.uint8), "RGB")
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_reference_tile_embeds_band_on_black(mode: str) -> None:
+    band = _band_for(mode)
+    out = build_reference_tile_and_mask(conditioning_band=band, mode=mode)  # type: ignore[arg-type]
+
+    expected = Image.new("RGB", (TILE_PX, TILE_PX), (0, 0, 0))
+    expected.paste(band, _BAND_REGION[mode][0])
+
+    assert out.reference_tile_rgb.mode == "RGB"
+    assert out.reference_tile_rgb.tobytes() == expected.tobytes()
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_mask_ramps_fix_to_free_toward_frontier(mode: str) -> None:
+    out = build_reference_tile_and_mask(conditioning_band=_band_for(mode), mode=mode)  # type: ignore[arg-type]
+    assert out.mask_rgba.mode == "RGBA"
+    assert out.mask_rgba.size == (TILE_PX, TILE_PX)
+
+    rgba = np.asarray(out.mask_rgba)
+    assert not rgba[..., :3].any()
+
+    alpha = rgba[..., 3]
+    ys, xs = _BAND_REGION[mode][1]
+    outside = np.ones_like(alpha, dtype=bool)
+    outside[ys, xs] = False
+    assert not alpha[outside].any()
+
+    band_alpha = alpha[ys, xs]
+    profile = band_alpha[0, :] if mode in ("x_ltr", "x_rtl") else band_alpha[:, 0]
+    if mode in ("x_ltr", "y_ttb"):
+        assert (profile[0], profile[-1]) == (255, 0)
+    else:
+        assert (profile[0], profile[-1]) == (0, 255)
+
+
+def test_encode_png_bytes_round_trips() -> None:
+    a = Image.new("RGB", (8, 8), (1, 2, 3))
+    assert Image.open(io.BytesIO(encode_png_bytes(a))).tobytes() == a.tobytes()
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_mask_png_bytes_are_encoded_once_per_mode_and_level(mode: str) -> None:
+    first = encode_mask_png_bytes(mode, compress_level=1)  # type: ignore[arg-type]
+    assert encode_mask_png_bytes(mode, compress_level=1) is first  # type: ignore[arg-type]
+
+    mask = build_reference_tile_and_mask(conditioning_band=_band_for(mode), mode=mode).mask_rgba  # type: ignore[arg-type]
+    with Image.open(io.BytesIO(first)) as decoded:
+        assert decoded.mode == "RGBA"
+        assert decoded.tobytes() == mask.tobytes()
+
+
+def test_mask_is_a_private_copy_per_call() -> None:
+    first = build_reference_tile_and_mask(conditioning_band=_band_for("x_ltr"), mode="x_ltr")
+    first.mask_rgba.putpixel((0, 0), (1, 2, 3, 4))
+
+    second = build_reference_tile_and_mask(conditioning_band=_band_for("x_ltr"), mode="x_ltr")
+    assert second.mask_rgba.getpixel((0, 0)) == (0, 0, 0, 255)
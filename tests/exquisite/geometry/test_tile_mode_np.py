@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from imkerutils.exquisite.geometry import tile_mode, tile_mode_np
+from imkerutils.exquisite.geometry.tile_mode import TILE_PX, BAND_PX
+
+MODES = ["x_ltr", "x_rtl", "y_ttb", "y_btt"]
+
+
+def _noise(size: tuple[int, int], seed: int) -> Image.Image:
+    w, h = size
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 256, (h, w, 3), dtype=np.uint8), "RGB")
+
+
+def _canvas_for(mode: str, grow: int) -> Image.Image:
+    if mode in ("x_ltr", "x_rtl"):
+        return _noise((TILE_PX + grow, TILE_PX), seed=1)
+    return _noise((TILE_PX, TILE_PX + grow), seed=1)
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("tile_size", [(TILE_PX, TILE_PX), (BAND_PX, TILE_PX), (TILE_PX, BAND_PX)])
+def test_glue_matches_pillow(mode: str, tile_size: tuple[int, int]) -> None:
+    canvas = _canvas_for(mode, grow=BAND_PX)
+    tile = _noise(tile_size, seed=2)
+
+    expected = tile_mode.glue(canvas, tile, mode)  # type: ignore[arg-type]
+    out = tile_mode_np.glue(np.asarray(canvas), np.asarray(tile), mode)  # type: ignore[arg-type]
+
+    assert out.shape == (expected.height, expected.width, 3)
+    assert out.tobytes() == expected.tobytes()
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_glue_rejects_wrong_non_growing_dimension(mode: str) -> None:
+    size = (TILE_PX, TILE_PX + 1) if mode in ("x_ltr", "x_rtl") else (TILE_PX + 1, TILE_PX)
+    canvas = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+    with pytest.raises(ValueError):
+        tile_mode_np.glue(canvas, np.zeros((TILE_PX, TILE_PX, 3), dtype=np.uint8), mode)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_extract_conditioning_band_matches_pillow(mode: str) -> None:
+    canvas = _canvas_for(mode, grow=BAND_PX)
+    band = tile_mode_np.extract_conditioning_band(np.asarray(canvas), mode)  # type: ignore[arg-type]
+    assert band.tobytes() == tile_mode.extract_conditioning_band(canvas, mode).tobytes()  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_canvas_view_step_matches_pillow(mode: str) -> None:
+    canvas = _canvas_for(mode, grow=0)
+    tile = _noise((TILE_PX, TILE_PX), seed=2)
+
+    view = tile_mode_np.CanvasView.from_image(canvas)
+    assert view.band(mode).tobytes() == tile_mode.extract_conditioning_band(canvas, mode).tobytes()  # type: ignore[arg-type]
+
+    nxt = view.glue(np.asarray(tile), mode)  # type: ignore[arg-type]
+    expected = tile_mode.glue(canvas, tile, mode)  # type: ignore[arg-type]
+    assert nxt.size == expected.size
+    assert nxt.image.tobytes() == expected.tobytes()
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_split_tile_returns_views_matching_pillow(mode: str) -> None:
+    tile = _noise((TILE_PX, TILE_PX), seed=4)
+    arr = np.asarray(tile)
+
+    cond, new = tile_mode_np.split_tile(arr, mode)  # type: ignore[arg-type]
+    exp_cond, exp_new = tile_mode.split_tile(tile, mode)  # type: ignore[arg-type]
+
+    assert cond.tobytes() == exp_cond.tobytes()
+    assert new.tobytes() == exp_new.tobytes()
+    assert np.shares_memory(cond, arr) and np.shares_memory(new, arr)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_split_tile_rejects_wrong_tile_size(mode: str) -> None:
+    with pytest.raises(ValueError):
+        tile_mode_np.split_tile(np.zeros((TILE_PX - 1, TILE_PX, 3), dtype=np.uint8), mode)  # type: ignore[arg-type]
+
+
+def test_canvas_view_rejects_non_rgb_arrays() -> None:
+    with pytest.raises(ValueError):
+        tile_mode_np.CanvasView(np.zeros((TILE_PX, TILE_PX, 4), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        tile_mode_np.CanvasView(np.zeros((TILE_PX, TILE_PX, 3), dtype=np.float32))
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_canvas_view_glue_accepts_image_tiles(mode: str) -> None:
+    canvas = _canvas_for(mode, grow=0)
+    tile = _noise((TILE_PX, TILE_PX), seed=5).convert("RGBA")
+
+    nxt = tile_mode_np.CanvasView.from_image(canvas).glue(tile, mode)  # type: ignore[arg-type]
+    assert nxt.image.tobytes() == tile_mode.glue(canvas, tile, mode).tobytes()  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_decompose_tile_patch_matches_pillow(mode: str) -> None:
+    tile = _noise((TILE_PX, TILE_PX), seed=6)
+    arr = np.asarray(tile)
+
+    cond, new, patch = tile_mode_np.decompose_tile(arr, mode)  # type: ignore[arg-type]
+    exp_cond, exp_new = tile_mode.split_tile(tile, mode)  # type: ignore[arg-type]
+    exp_patch = tile_mode._tile_patch_for_overlap_glue(tile, mode)  # type: ignore[arg-type]
+
+    assert cond.tobytes() == exp_cond.tobytes()
+    assert new.tobytes() == exp_new.tobytes()
+    assert patch.tobytes() == exp_patch.tobytes()
+    assert all(np.shares_memory(v, arr) for v in (cond, new, patch))
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_rolling_canvas_matches_repeated_glue(mode: str) -> None:
+    canvas = _canvas_for(mode, grow=0)
+    tiles = [_noise((TILE_PX, TILE_PX), seed=10 + k) for k in range(3)]
+    tiles.append(_noise((BAND_PX, TILE_PX) if mode in ("x_ltr", "x_rtl") else (TILE_PX, BAND_PX), seed=20))
+
+    rolling = tile_mode_np.RollingCanvas(np.asarray(canvas), mode, max_steps=len(tiles))  # type: ignore[arg-type]
+    expected = canvas
+    for tile in tiles:
+        assert rolling.band().tobytes() == tile_mode.extract_conditioning_band(expected, mode).tobytes()  # type: ignore[arg-type]
+        rolling.glue_inplace(np.asarray(tile))
+        expected = tile_mode.glue(expected, tile, mode)  # type: ignore[arg-type]
+        assert rolling.size == expected.size
+        assert rolling.arr.tobytes() == expected.tobytes()
+
+    with pytest.raises(ValueError):
+        rolling.glue_inplace(np.asarray(tiles[0]))
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_extract_conditioning_band_as_ndarray(mode: str) -> None:
+    canvas = _canvas_for(mode, grow=BAND_PX)
+    band_img = tile_mode.extract_conditioning_band(canvas, mode)  # type: ignore[arg-type]
+    band_arr = tile_mode.extract_conditioning_band(canvas, mode, as_ndarray=True)  # type: ignore[arg-type]
+
+    assert isinstance(band_arr, np.ndarray)
+    assert band_arr.flags.c_contiguous
+    assert band_arr.shape == (band_img.height, band_img.width, 3)
+    assert band_arr.tobytes() == band_img.tobytes()
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_glue_sequence_matches_repeated_glue(mode: str) -> None:
+    canvas = _canvas_for(mode, grow=0)
+    tiles = [_noise((TILE_PX, TILE_PX), seed=30 + k) for k in range(3)]
+
+    expected = canvas
+    for tile in tiles:
+        expected = tile_mode.glue(expected, tile, mode)  # type: ignore[arg-type]
+
+    got = tile_mode_np.glue_sequence(np.asarray(canvas), [np.asarray(t) for t in tiles], mode)  # type: ignore[arg-type]
+    assert got.shape == (expected.height, expected.width, 3)
+    assert got.tobytes() == expected.tobytes()
+
+
+def test_rgb_array_views_rgba_without_converting() -> None:
+    rgba = Image.fromarray(np.random.default_rng(5).integers(0, 256, (16, 24, 4), dtype=np.uint8), "RGBA")
+
+    arr = tile_mode_np.rgb_array(rgba)
+    assert arr.shape == (16, 24, 3)
+    assert arr.tobytes() == rgba.convert("RGB").tobytes()
+
+    view = tile_mode_np.CanvasView.from_image(rgba)
+    assert view.image.mode == "RGB"
+    assert view.image.tobytes() == rgba.convert("RGB").tobytes()
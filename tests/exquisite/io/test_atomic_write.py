@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from imkerutils.exquisite.io import atomic_write
+from imkerutils.exquisite.io.atomic_write import (
+    DeferredFsync,
+    atomic_link_or_copy,
+    atomic_write_bytes,
+    atomic_write_text,
+    atomic_write_with,
+    atomic_write_with_fd,
+    flush_pending,
+)
+
+
+def _leftover_tmps(d: Path) -> list[str]:
+    return [p.name for p in d.iterdir() if p.name.endswith(".tmp")]
+
+
+def test_atomic_write_bytes_and_text_replace_contents(tmp_path: Path) -> None:
+    dst = tmp_path / "sub" / "a.bin"
+    atomic_write_bytes(dst, b"one")
+    atomic_write_text(dst, "two\n")
+    assert dst.read_bytes() == b"two\n"
+    assert _leftover_tmps(dst.parent) == []
+
+
+def test_atomic_write_with_cleans_up_when_writer_fails(tmp_path: Path) -> None:
+    dst = tmp_path / "b.png"
+
+    def boom(p: Path) -> None:
+        p.write_bytes(b"partial")
+        raise RuntimeError("writer failed")
+
+    with pytest.raises(RuntimeError):
+        atomic_write_with(dst, boom)
+    assert not dst.exists()
+    assert _leftover_tmps(tmp_path) == []
+
+
+def test_non_durable_writes_defer_fsync_until_flush(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    synced: list[int] = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(atomic_write.os, "fsync", lambda fd: (synced.append(fd), real_fsync(fd))[1])
+
+    atomic_write_bytes(tmp_path / "a", b"a", durable=False)
+    atomic_write_with(tmp_path / "b", lambda p: p.write_bytes(b"b"), durable=False)
+    assert synced == []
+    assert (tmp_path / "a").read_bytes() == b"a"
+
+    flush_pending()
+    assert len(synced) == 3  # two files + their shared directory
+
+    flush_pending()
+    assert len(synced) == 3
+
+
+def test_deferred_fsync_batches_flush_only_their_own_writes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    synced: list[str] = []
+    monkeypatch.setattr(atomic_write, "_fsync_file", lambda p: synced.append(os.path.basename(p)))
+    monkeypatch.setattr(atomic_write, "_fsync_dir", lambda p: None)
+
+    a, b = DeferredFsync(), DeferredFsync()
+    atomic_write_bytes(tmp_path / "a", b"a", durable=a)
+    atomic_write_bytes(tmp_path / "b", b"b", durable=b)
+    atomic_write_bytes(tmp_path / "c", b"c", durable=False)
+
+    a.flush()
+    assert synced == ["a"]
+    b.flush()
+    assert synced == ["a", "b"]
+    flush_pending()
+    assert synced == ["a", "b", "c"]
+
+
+def test_atomic_write_bytes_accepts_buffers_and_chunk_iterables(tmp_path: Path) -> None:
+    payload = bytes(range(256)) * 9000  # > 1 MiB, spans several write chunks
+
+    atomic_write_bytes(tmp_path / "mv", memoryview(payload))
+    assert (tmp_path / "mv").read_bytes() == payload
+
+    atomic_write_bytes(tmp_path / "it", (payload[i:i + 4096] for i in range(0, len(payload), 4096)))
+    assert (tmp_path / "it").read_bytes() == payload
+
+
+def test_atomic_write_bytes_cleans_up_when_chunk_producer_fails(tmp_path: Path) -> None:
+    def chunks():
+        yield b"first"
+        raise RuntimeError("encoder failed")
+
+    with pytest.raises(RuntimeError):
+        atomic_write_bytes(tmp_path / "c", chunks())
+    assert not (tmp_path / "c").exists()
+    assert _leftover_tmps(tmp_path) == []
+
+
+@pytest.mark.parametrize("unnamed", [True, False])
+def test_atomic_write_accepts_str_and_bare_filenames(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, unnamed: bool
+) -> None:
+    if not unnamed:
+        monkeypatch.setattr(atomic_write, "_O_TMPFILE", None)
+    monkeypatch.chdir(tmp_path)
+
+    atomic_write_bytes("bare.bin", b"x")
+    atomic_write_bytes(str(tmp_path / "new" / "dir" / "f.bin"), b"y")
+
+    assert (tmp_path / "bare.bin").read_bytes() == b"x"
+    assert (tmp_path / "new" / "dir" / "f.bin").read_bytes() == b"y"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["bare.bin", "new"]
+
+
+def test_atomic_write_with_fd_writes_through_open_fd(tmp_path: Path) -> None:
+    img = Image.new("RGB", (8, 4), (1, 2, 3))
+    dst = tmp_path / "img.png"
+
+    atomic_write_with_fd(dst, lambda fd, _p: img.save(os.fdopen(fd, "wb", closefd=False), format="PNG"))
+
+    with Image.open(dst) as got:
+        assert got.tobytes() == img.tobytes()
+    assert _leftover_tmps(tmp_path) == []
+
+    def boom(fd: int, _p: Path) -> None:
+        os.write(fd, b"partial")
+        raise RuntimeError("encoder failed")
+
+    with pytest.raises(RuntimeError):
+        atomic_write_with_fd(dst, boom)
+    assert _leftover_tmps(tmp_path) == []
+    with Image.open(dst) as got:
+        assert got.size == (8, 4)
+
+
+def test_atomic_link_or_copy_links_and_falls_back_to_copy(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    src = tmp_path / "steps" / "src.png"
+    atomic_write_bytes(src, b"canvas")
+    (tmp_path / "latest.png").write_bytes(b"old")
+
+    atomic_link_or_copy(src, tmp_path / "latest.png")
+    assert (tmp_path / "latest.png").read_bytes() == b"canvas"
+    assert os.path.samefile(src, tmp_path / "latest.png")
+
+    def no_link(*_a, **_k):
+        raise OSError("EXDEV")
+
+    monkeypatch.setattr(atomic_write.os, "link", no_link)
+    atomic_link_or_copy(src, tmp_path / "copy.png")
+    assert (tmp_path / "copy.png").read_bytes() == b"canvas"
+    assert not os.path.samefile(src, tmp_path / "copy.png")
+    assert _leftover_tmps(tmp_path) == []
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import hashlib
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from imkerutils.exquisite.geometry.tile_mode import TILE_PX, HALF_PX, glue
+from imkerutils.exquisite.pipeline.session import _feather_mask, _glue_with_feather, _img_eq
+
+MODES = ["x_ltr", "x_rtl", "y_ttb", "y_btt"]
+
+# sha256 prefixes of _glue_with_feather(feather_px=64) on the inputs below, as
+# produced by the original putdata/paste/composite implementation.
+_GOLDEN = {
+    "x_ltr": "213c6feb1fd35398",
+    "x_rtl": "bf22392fe90b08e4",
+    "y_ttb": "8c5ed1152d0252c9",
+    "y_btt": "8c43d47ce8d453aa",
+}
+
+
+def _noise(size: tuple[int, int], seed: int) -> Image.Image:
+    w, h = size
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 256, (h, w, 3), dtype=np.uint8), "RGB")
+
+
+def _inputs(mode: str) -> tuple[Image.Image, Image.Image]:
+    size = (TILE_PX + HALF_PX, TILE_PX) if mode in ("x_ltr", "x_rtl") else (TILE_PX, TILE_PX + HALF_PX)
+    return _noise(size, seed=1), _noise((TILE_PX, TILE_PX), seed=2)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_feathered_glue_matches_golden_output(mode: str) -> None:
+    canvas, tile = _inputs(mode)
+    out = _glue_with_feather(canvas=canvas, tile=tile, mode=mode, feather_px=64)  # type: ignore[arg-type]
+    assert hashlib.sha256(out.tobytes()).hexdigest()[:16] == _GOLDEN[mode]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_zero_feather_is_hard_glue(mode: str) -> None:
+    canvas, tile = _inputs(mode)
+    out = _glue_with_feather(canvas=canvas, tile=tile, mode=mode, feather_px=0)  # type: ignore[arg-type]
+    assert out.tobytes() == glue(canvas, tile, mode).tobytes()  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_feather_mask_is_built_once_per_mode_and_width(mode: str) -> None:
+    assert _feather_mask(mode, 64) is _feather_mask(mode, 64)  # type: ignore[arg-type]
+    assert _feather_mask(mode, 64) is not _feather_mask(mode, 32)  # type: ignore[arg-type]
+
+
+def test_img_eq_compares_every_channel() -> None:
+    a = _noise((64, 32), seed=7)
+    pixels = np.asarray(a).copy()
+    pixels[5, 9, 2] ^= 1
+    assert _img_eq(a, a.copy())
+    assert not _img_eq(a, Image.fromarray(pixels, "RGB"))
+    assert not _img_eq(a.convert("RGBA"), Image.fromarray(pixels, "RGB").convert("RGBA"))
+    assert not _img_eq(a, a.crop((0, 0, 32, 32)))
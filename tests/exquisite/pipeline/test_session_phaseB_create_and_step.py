@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import os
+import shutil
 from pathlib import Path
 
 import pytest
 from PIL import Image
 
 from imkerutils.exquisite.pipeline.session import ExquisiteSession
-from imkerutils.exquisite.geometry.tile_mode import TILE_PX
+from imkerutils.exquisite.geometry.tile_mode import TILE_PX, extract_conditioning_band
 
 
 def _write_initial_canvas(path: Path) -> None:
@@ -66,4 +68,79 @@ def test_one_disk_step_commits_and_grows(tmp_path: Path, mode: str) -> None:
         assert w == TILE_PX + 512
     else:
         assert w == TILE_PX
-        assert h == TILE_PX + 512
\ No newline at end of file
+        assert h == TILE_PX + 512
+
+@pytest.mark.parametrize("mode", ["x_ltr", "x_rtl", "y_ttb", "y_btt"])
+def test_consecutive_steps_reuse_in_memory_canvas(tmp_path: Path, mode: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    initial = tmp_path / "initial.png"
+    _write_initial_canvas(initial)
+
+    artifact_root = tmp_path / "_generated" / "exquisite"
+    sess = ExquisiteSession.create(initial_canvas_path=initial, mode=mode, artifact_root=artifact_root)  # type: ignore[arg-type]
+    assert sess.execute_step_mock(prompt="a").status == "committed"
+
+    def no_decode(*_a, **_k):
+        raise AssertionError("canvas re-read from disk")
+
+    monkeypatch.setattr(Image, "open", no_decode)
+    res = sess.execute_step_mock(prompt="b")
+    monkeypatch.undo()
+    assert res.status == "committed"
+
+    with Image.open(Path(sess.state.session_root) / "canvas_latest.png") as on_disk:
+        assert on_disk.convert("RGB").tobytes() == sess._current_canvas().tobytes()
+
+
+@pytest.mark.parametrize("mode", ["x_ltr", "x_rtl", "y_ttb", "y_btt"])
+def test_step_redecodes_canvas_replaced_on_disk(tmp_path: Path, mode: str) -> None:
+    initial = tmp_path / "initial.png"
+    _write_initial_canvas(initial)
+
+    artifact_root = tmp_path / "_generated" / "exquisite"
+    sess = ExquisiteSession.create(initial_canvas_path=initial, mode=mode, artifact_root=artifact_root)  # type: ignore[arg-type]
+    assert sess.execute_step_mock(prompt="a").status == "committed"
+
+    # Another process swaps in a different canvas of the same size.
+    canvas_path = Path(sess.state.canvas_path)
+    with Image.open(canvas_path) as im:
+        replaced = Image.new("RGB", im.size, (200, 30, 90))
+    replaced.save(tmp_path / "replaced.png", format="PNG")
+    os.replace(tmp_path / "replaced.png", canvas_path)
+
+    res = sess.execute_step_mock(prompt="b")
+    assert res.status == "committed"
+    with Image.open(Path(res.step_dir) / "conditioning_band.png") as band:
+        assert band.tobytes() == extract_conditioning_band(replaced, mode).tobytes()  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("mode", ["x_ltr", "x_rtl", "y_ttb", "y_btt"])
+def test_size_rejection_after_open_does_not_decode_canvas(tmp_path: Path, mode: str) -> None:
+    initial = tmp_path / "initial.png"
+    _write_initial_canvas(initial)
+
+    artifact_root = tmp_path / "_generated" / "exquisite"
+    created = ExquisiteSession.create(initial_canvas_path=initial, mode=mode, artifact_root=artifact_root)  # type: ignore[arg-type]
+    Image.new("RGB", (TILE_PX - 24, TILE_PX - 24)).save(created.state.canvas_path, format="PNG")
+
+    sess = ExquisiteSession.open(session_root=Path(created.state.session_root))
+    res = sess.execute_step_mock(prompt="hello")
+
+    assert res.status == "rejected"
+    assert res.rejection_reason in ("CanvasHeightNot1024", "CanvasWidthNot1024")
+    assert sess._canvas is None
+
+
+@pytest.mark.parametrize("mode", ["x_ltr", "x_rtl", "y_ttb", "y_btt"])
+def test_step_recreates_missing_steps_dir(tmp_path: Path, mode: str) -> None:
+    initial = tmp_path / "initial.png"
+    _write_initial_canvas(initial)
+
+    artifact_root = tmp_path / "_generated" / "exquisite"
+    created = ExquisiteSession.create(initial_canvas_path=initial, mode=mode, artifact_root=artifact_root)  # type: ignore[arg-type]
+    shutil.rmtree(Path(created.state.session_root) / "steps")
+
+    sess = ExquisiteSession.open(session_root=Path(created.state.session_root))
+    res = sess.execute_step_mock(prompt="hello")
+
+    assert res.status == "committed"
+    assert (Path(res.step_dir) / "committed.ok").exists()
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from imkerutils.exquisite.api.client import GeneratorTransientError
+from imkerutils.exquisite.api.mock_client import MockTileGeneratorClient
+from imkerutils.exquisite.geometry.tile_mode import TILE_PX, ADVANCE_PX
+from imkerutils.exquisite.io import atomic_write as atomic_write_mod
+from imkerutils.exquisite.pipeline import session as session_mod
+from imkerutils.exquisite.pipeline.session import ExquisiteSession
+from imkerutils.exquisite.tools.render_npys import render_npys
+
+MODES = ["x_ltr", "x_rtl", "y_ttb", "y_btt"]
+
+
+class _FailingClient(MockTileGeneratorClient):
+    def generate_tile(self, **_kwargs) -> Image.Image:  # type: ignore[override]
+        raise GeneratorTransientError("Request timed out.")
+
+
+def _session(tmp_path: Path, mode: str) -> ExquisiteSession:
+    initial = tmp_path / "initial.png"
+    Image.new("RGB", (TILE_PX, TILE_PX), (40, 80, 120)).save(initial, format="PNG")
+    return ExquisiteSession.create(
+        initial_canvas_path=initial,
+        mode=mode,  # type: ignore[arg-type]
+        artifact_root=tmp_path / "_generated" / "exquisite",
+    )
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_real_step_commits_artifacts_and_latest_canvas(tmp_path: Path, mode: str) -> None:
+    sess = _session(tmp_path, mode)
+
+    for k in (1, 2):
+        res = sess.execute_step_real(prompt=f"p{k}", client=MockTileGeneratorClient())
+        assert res.status == "committed", res.rejection_reason
+
+    step_dir = Path(res.step_dir)
+    for name in (
+        "prompt.txt",
+        "conditioning_band.png",
+        "canvas_before.png",
+        "tile_full.png",
+        "new_half.png",
+        "canvas_after.png",
+        "committed.ok",
+    ):
+        assert (step_dir / name).exists(), name
+
+    latest = Path(sess.state.canvas_path)
+    assert latest.read_bytes() == (step_dir / "canvas_after.png").read_bytes()
+    with Image.open(latest) as img:
+        grown = TILE_PX + 2 * ADVANCE_PX
+        assert img.size == ((grown, TILE_PX) if mode in ("x_ltr", "x_rtl") else (TILE_PX, grown))
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_rejected_real_step_keeps_inputs_and_canvas(tmp_path: Path, mode: str) -> None:
+    sess = _session(tmp_path, mode)
+    before = Path(sess.state.canvas_path).read_bytes()
+
+    res = sess.execute_step_real(prompt="p", client=_FailingClient())
+
+    assert res.status == "rejected"
+    assert res.rejection_reason.startswith("GeneratorError")
+    step_dir = Path(res.step_dir)
+    assert (step_dir / "rejected.err").exists()
+    assert (step_dir / "conditioning_band.png").exists()
+    assert (step_dir / "canvas_before.png").exists()
+    assert not (step_dir / "committed.ok").exists()
+    assert Path(sess.state.canvas_path).read_bytes() == before
+    assert sess.state.step_index_current == 0
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_step_artifacts_are_flushed_before_commit_marker(tmp_path: Path, mode: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    sess = _session(tmp_path, mode)
+    step_dir = sess.state.step_dir(1)
+    seen: list[tuple[bool, bool, bool]] = []
+    real_flush = session_mod.DeferredFsync.flush
+
+    def flush_spy(batch: session_mod.DeferredFsync) -> None:
+        seen.append((
+            (step_dir / "canvas_after.png").exists(),
+            str(step_dir / "canvas_after.png") in batch._files,
+            (step_dir / "committed.ok").exists(),
+        ))
+        real_flush(batch)
+
+    monkeypatch.setattr(session_mod.DeferredFsync, "flush", flush_spy)
+    res = sess.execute_step_real(prompt="p", client=MockTileGeneratorClient())
+
+    assert res.status == "committed"
+    assert seen and seen[0] == (True, True, False)
+
+
+@pytest.mark.parametrize("step", ["mock", "real"])
+def test_concurrent_sessions_fsync_their_own_artifacts_before_commit(
+    tmp_path: Path, step: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+    sessions = [_session(tmp_path / name, "x_ltr") for name in ("a", "b")]
+
+    synced: set[str] = set()
+    unsynced_at_commit: list[list[str]] = []
+    lock = threading.Lock()
+    real_fsync_file = atomic_write_mod._fsync_file
+    real_write_text = session_mod.atomic_write_text
+
+    def slow_fsync_file(path: str) -> None:
+        time.sleep(0.002)  # widen the window in which another session could commit
+        real_fsync_file(path)
+        with lock:
+            synced.add(path)
+
+    def checking_write_text(path, text, *args, **kwargs) -> None:
+        path = Path(path)
+        if path.name == "committed.ok":
+            step_files = [str(p) for p in path.parent.iterdir() if p.suffix in (".png", ".txt", ".npy")]
+            with lock:
+                unsynced_at_commit.append([p for p in step_files if p not in synced])
+        real_write_text(path, text, *args, **kwargs)
+
+    monkeypatch.setattr(atomic_write_mod, "_fsync_file", slow_fsync_file)
+    monkeypatch.setattr(session_mod, "atomic_write_text", checking_write_text)
+
+    errors: list[BaseException] = []
+
+    def run(sess: ExquisiteSession) -> None:
+        try:
+            for k in range(3):
+                if step == "mock":
+                    res = sess.execute_step_mock(prompt=f"p{k}")
+                else:
+                    res = sess.execute_step_real(prompt=f"p{k}", client=MockTileGeneratorClient())
+                assert res.status == "committed"
+        except BaseException as e:  # surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(sess,)) for sess in sessions]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors, errors
+    assert len(unsynced_at_commit) == 6
+    assert all(not unsynced for unsynced in unsynced_at_commit), unsynced_at_commit
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_raw_debug_artifacts_render_back_to_png(tmp_path: Path, mode: str) -> None:
+    sess = _session(tmp_path, mode)
+    res = sess.execute_step_mock(prompt="p", debug_artifacts=False)
+    assert res.status == "committed"
+
+    step_dir = Path(res.step_dir)
+    stems = ("conditioning_band", "tile_full", "tile_patch", "new_half")
+    for stem in stems:
+        assert (step_dir / f"{stem}.npy").exists(), stem
+        assert not (step_dir / f"{stem}.png").exists(), stem
+    assert (step_dir / "canvas_before.png").exists()
+    assert (step_dir / "canvas_after.png").exists()
+
+    rendered = render_npys(Path(sess.state.session_root))
+    assert sorted(p.name for p in rendered) == sorted(f"{stem}.png" for stem in stems)
+    with Image.open(step_dir / "tile_full.png") as tile_png:
+        assert tile_png.tobytes() == np.load(step_dir / "tile_full.npy").tobytes()
+    assert render_npys(step_dir) == []
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_canvas_before_is_previous_latest_canvas(tmp_path: Path, mode: str) -> None:
+    sess = _session(tmp_path, mode)
+    first = sess.execute_step_real(prompt="a", client=MockTileGeneratorClient())
+    second = sess.execute_step_real(prompt="b", client=MockTileGeneratorClient())
+
+    before = Path(second.step_dir) / "canvas_before.png"
+    assert before.read_bytes() == (Path(first.step_dir) / "canvas_after.png").read_bytes()
+    with Image.open(before) as img:
+        assert img.size == first.canvas_after_size
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_failed_input_write_does_not_replace_rejection(
+    tmp_path: Path, mode: str, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    sess = _session(tmp_path, mode)
+
+    def failing_save(*_args, **_kwargs) -> Path:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(session_mod, "_save_artifact", failing_save)
+    with caplog.at_level("WARNING", logger=session_mod.__name__):
+        res = sess.execute_step_real(prompt="p", client=_FailingClient())
+
+    assert res.status == "rejected"
+    assert res.rejection_reason.startswith("GeneratorError")
+    assert "disk full" in caplog.text
+
+
+def test_close_shuts_down_io_pool(tmp_path: Path) -> None:
+    with _session(tmp_path, "x_ltr") as sess:
+        res = sess.execute_step_real(prompt="p", client=MockTileGeneratorClient())
+        assert res.status == "committed"
+
+    with pytest.raises(RuntimeError):
+        sess._io_pool.submit(print)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_mock_step_artifacts_encode_on_io_pool(tmp_path: Path, mode: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    sess = _session(tmp_path, mode)
+    threads: list[str] = []
+    real_save = session_mod._save_artifact
+
+    def save_spy(*args, **kwargs) -> Path:
+        threads.append(threading.current_thread().name)
+        return real_save(*args, **kwargs)
+
+    monkeypatch.setattr(session_mod, "_save_artifact", save_spy)
+    res = sess.execute_step_mock(prompt="p")
+
+    assert res.status == "committed"
+    assert threads and all(name.startswith("exquisite-io") for name in threads)
+    step_dir = Path(res.step_dir)
+    for name in ("prompt.txt", "conditioning_band.png", "canvas_before.png", "tile_full.png", "tile_patch.png", "new_half.png"):
+        assert (step_dir / name).exists(), name
+    assert Path(sess.state.canvas_path).read_bytes() == (step_dir / "canvas_after.png").read_bytes()